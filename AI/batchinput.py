@@ -0,0 +1,19 @@
+import numpy as np
+import pandas as pd
+
+# Column helpers shared by the predict_*_batch() functions
+
+
+def numeric(values):
+    # Column as float64; anything that is not a number becomes NaN
+    values = np.asarray(values).ravel()
+    if values.dtype.kind in 'biuf':
+        return values.astype(np.float64)
+    return pd.to_numeric(values, errors='coerce').astype(np.float64)
+
+
+def finite(values):
+    # True where the value is still finite after sklearn's float32 cast
+    # (rejects NaN, +-inf and anything that overflows float32)
+    with np.errstate(over='ignore'):
+        return np.isfinite(values.astype(np.float32))
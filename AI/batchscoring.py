@@ -0,0 +1,86 @@
+import argparse
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import joblib
+import pandas as pd
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+FEATURES = ['TotalSpend', 'PurchaseFrequency', 'PreferredProduct']
+
+_model = None
+
+
+def _init_worker(model_path):
+    # Each worker process deserializes the model once
+    global _model
+    _model = joblib.load(model_path)
+
+
+def score_chunk(chunk, model=None):
+    model = model if model is not None else _model
+    # One predict_proba pass; the class is the argmax, as in RandomForest.predict
+    proba = model.predict_proba(chunk[FEATURES])
+    classes = model.classes_
+    scores = pd.DataFrame({
+        'CustomerID': chunk['CustomerID'].to_numpy(),
+        'PredictedVIP': classes[proba.argmax(axis=1)],
+        'VIPProbability': proba[:, list(classes).index(1)].round(4),
+    })
+    return scores
+
+
+def score_file(input_path, model_path, output_path, chunksize=100000, workers=0):
+    start = time.perf_counter()
+    rows = 0
+    chunks = pd.read_csv(input_path, usecols=['CustomerID'] + FEATURES, chunksize=chunksize)
+
+    with open(output_path, 'w', newline='') as out:
+        header = True
+
+        def write(scores):
+            nonlocal header, rows
+            scores.to_csv(out, index=False, header=header)
+            header = False
+            rows += len(scores)
+
+        if workers:
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                     initargs=(model_path,)) as pool:
+                # Keep at most 2 chunks per worker in flight so memory stays bounded
+                pending = deque()
+                for chunk in chunks:
+                    pending.append(pool.submit(score_chunk, chunk))
+                    if len(pending) >= 2 * workers:
+                        write(pending.popleft().result())
+                while pending:
+                    write(pending.popleft().result())
+        else:
+            model = joblib.load(model_path)
+            for chunk in chunks:
+                write(score_chunk(chunk, model))
+
+    elapsed = time.perf_counter() - start
+    return rows, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Score every customer with the VIP model.")
+    parser.add_argument('--input', default=os.path.join(BASE_DIR, 'datasets', 'customer_behavior_vip.csv'))
+    parser.add_argument('--model', default=os.path.join(BASE_DIR, 'models', 'customervipcheck', 'vip_model.joblib'))
+    parser.add_argument('--output', default=os.path.join(BASE_DIR, 'datasets', 'customer_vip_scores.csv'))
+    parser.add_argument('--chunksize', type=int, default=100000)
+    parser.add_argument('--workers', type=int, default=0,
+                        help="worker processes (0 scores in this process)")
+    args = parser.parse_args()
+
+    rows, elapsed = score_file(args.input, args.model, args.output, args.chunksize, args.workers)
+    print(f"Scored {rows} customers in {elapsed:.2f}s ({rows / elapsed:,.0f} rows/sec)")
+    print(f"Scores saved as: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,237 @@
+import argparse
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+# A trained Pipeline(ColumnTransformer(OneHotEncoder + passthrough),
+# RandomForestClassifier) flattened into a few NumPy arrays. One-hot columns
+# are folded back into their source column: a split on "PreferredProduct_Laptops
+# <= 0.5" becomes "PreferredProduct == Laptops goes right", with unknown
+# categories going left exactly like an all-zero one-hot row. Every split is
+# stored as "go right iff lower < x <= upper" (upper = inf for numeric splits,
+# code +- 0.5 for category codes), and all trees are walked together one
+# vectorised step per level, so a single row costs a few dozen array ops
+# instead of a pandas/ColumnTransformer round trip and 100 tree calls.
+# This is for online checks of one or a few rows; for bulk scoring
+# (AI/batchscoring.py) sklearn's compiled traversal remains faster.
+
+
+def compiled_path(model_path):
+    return os.path.splitext(model_path)[0] + '.npz'
+
+
+class CompiledForest:
+    def __init__(self, columns, categories, classes, roots, feature, lower, upper, children, value, max_depth):
+        self.columns = list(columns)
+        # Column name -> categories (only for one-hot encoded columns)
+        self.categories = {name: pd.Index(values) for name, values in categories.items()}
+        self._codes = {name: {category: code for code, category in enumerate(values)}
+                       for name, values in self.categories.items()}
+        self.classes = classes
+        self.roots = roots
+        self.feature = feature
+        self.lower = lower
+        self.upper = upper
+        # (node, 0) is the left child, (node, 1) the right one; leaves point to themselves
+        self.children = children
+        self.is_leaf = children[:, 0] == np.arange(len(children))
+        self.value = value
+        self.max_depth = int(max_depth)
+
+    @classmethod
+    def from_pipeline(cls, pipeline):
+        from sklearn.preprocessing import FunctionTransformer, OneHotEncoder
+
+        preprocessor = pipeline.named_steps['preprocessor']
+        forest = pipeline.named_steps['classifier']
+
+        # Transformed feature index -> (input column index, category code or -1)
+        columns, categories, mapping = [], {}, []
+        for name, transformer, source_columns in preprocessor.transformers_:
+            if transformer == 'drop' or name == 'remainder':
+                continue
+            if isinstance(transformer, OneHotEncoder):
+                if transformer.drop is not None:
+                    raise ValueError("OneHotEncoder with drop= cannot be compiled")
+                for column, column_categories in zip(source_columns, transformer.categories_):
+                    categories[column] = np.asarray(column_categories).astype(str)
+                    mapping.extend((len(columns), code) for code in range(len(column_categories)))
+                    columns.append(column)
+            elif transformer == 'passthrough' or (isinstance(transformer, FunctionTransformer)
+                                                  and transformer.func is None):
+                # Fitted ColumnTransformers hold 'passthrough' as an identity FunctionTransformer
+                for column in source_columns:
+                    mapping.append((len(columns), -1))
+                    columns.append(column)
+            else:
+                raise ValueError(f"Unsupported transformer for compilation: {transformer!r}")
+        mapping = np.array(mapping, dtype=np.int64)
+
+        roots, feature, lower, upper, children, value = [], [], [], [], [], []
+        offset, max_depth = 0, 0
+        for estimator in forest.estimators_:
+            tree = estimator.tree_
+            n = tree.node_count
+            is_leaf = tree.children_left == -1
+            source = mapping[np.where(is_leaf, 0, tree.feature)]
+            categorical = ~is_leaf & (source[:, 1] >= 0)
+            # One-hot split "x <= 0.5" is false only for this category's code
+            node_lower = np.where(categorical, source[:, 1] - 0.5, tree.threshold)
+            node_upper = np.where(categorical, source[:, 1] + 0.5, np.inf)
+            # Leaves point to themselves, which is how is_leaf recognises them
+            own = np.arange(n) + offset
+            node_children = np.column_stack([np.where(is_leaf, own, tree.children_left + offset),
+                                             np.where(is_leaf, own, tree.children_right + offset)])
+            # Older sklearn stores class counts, newer stores fractions
+            counts = tree.value[:, 0, :]
+            proba = counts / counts.sum(axis=1, keepdims=True)
+
+            roots.append(offset)
+            feature.append(np.where(is_leaf, 0, source[:, 0]))
+            lower.append(node_lower)
+            upper.append(node_upper)
+            children.append(node_children)
+            value.append(proba)
+            offset += n
+            max_depth = max(max_depth, tree.max_depth)
+
+        index_dtype = np.int32 if offset < 2 ** 31 else np.int64
+        return cls(
+            columns, categories, np.asarray(forest.classes_),
+            roots=np.array(roots, dtype=index_dtype),
+            feature=np.concatenate(feature).astype(np.int16),
+            lower=np.concatenate(lower).astype(np.float64),
+            upper=np.concatenate(upper).astype(np.float64),
+            children=np.concatenate(children).astype(index_dtype),
+            value=np.concatenate(value).astype(np.float64),
+            max_depth=max_depth,
+        )
+
+    def save(self, path):
+        arrays = {f"categories_{name}": values.to_numpy().astype(str) for name, values in self.categories.items()}
+        np.savez(path, columns=np.array(self.columns), classes=self.classes, roots=self.roots,
+                 feature=self.feature, lower=self.lower, upper=self.upper, children=self.children,
+                 value=self.value, max_depth=self.max_depth, **arrays)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path, allow_pickle=False) as data:
+            columns = data['columns'].tolist()
+            categories = {name: data[f"categories_{name}"] for name in columns
+                          if f"categories_{name}" in data.files}
+            return cls(columns, categories, data['classes'], data['roots'], data['feature'],
+                       data['lower'], data['upper'], data['children'], data['value'], data['max_depth'])
+
+    def encode(self, X):
+        # X: DataFrame or mapping of column -> values. Numbers are compared in
+        # float32 like sklearn's trees; categories become codes (-1 = unknown).
+        columns = [X[name] for name in self.columns]
+        columns = [values.to_numpy() if hasattr(values, 'to_numpy') else np.atleast_1d(np.asarray(values))
+                   for values in columns]
+        data = np.empty((len(columns[0]), len(self.columns)), dtype=np.float64)
+        for i, (name, values) in enumerate(zip(self.columns, columns)):
+            if name in self.categories and len(values) <= 64:
+                codes = self._codes[name]
+                data[:, i] = [codes.get(value, -1) for value in values]
+            elif name in self.categories:
+                data[:, i] = self.categories[name].get_indexer(values)
+            else:
+                data[:, i] = values.astype(np.float32)
+        return data
+
+    def _leaves(self, data):
+        # Leaf reached in every tree, shape (rows, trees). Only (row, tree)
+        # pairs still on an internal node take the next step.
+        n_trees, n_columns = len(self.roots), data.shape[1]
+        flat = data.ravel()
+        node = np.tile(self.roots, len(data))
+        offset = np.repeat(np.arange(len(data)) * n_columns, n_trees)
+        active = np.flatnonzero(~self.is_leaf[node])
+        while len(active):
+            current = node[active]
+            x = flat[offset[active] + self.feature[current]]
+            go_right = (x > self.lower[current]) & (x <= self.upper[current])
+            current = self.children[current, go_right.view(np.int8)]
+            node[active] = current
+            active = active[~self.is_leaf[current]]
+        return node.reshape(len(data), n_trees)
+
+    def predict_proba(self, X, chunksize=16384):
+        data = self.encode(X)
+        return np.concatenate([self.value[self._leaves(data[start:start + chunksize])].mean(axis=1)
+                               for start in range(0, max(len(data), 1), chunksize)])
+
+    def predict(self, X):
+        return self.classes[self.predict_proba(X).argmax(axis=1)]
+
+    @property
+    def classes_(self):
+        # sklearn spelling, so callers can treat both model kinds alike
+        return self.classes
+
+
+def export(model_path, output_path=None):
+    import joblib
+
+    output_path = output_path or compiled_path(model_path)
+    compiled = CompiledForest.from_pipeline(joblib.load(model_path))
+    compiled.save(output_path)
+    return compiled, output_path
+
+
+def check(pipeline, compiled, X):
+    # Parity against the sklearn pipeline: largest probability difference and
+    # number of rows whose predicted class differs
+    expected = pipeline.predict_proba(X)
+    actual = compiled.predict_proba(X)
+    mismatches = int((pipeline.predict(X) != compiled.predict(X)).sum())
+    return float(np.abs(expected - actual).max()), mismatches
+
+
+def _single_row_seconds(predict, row, repeat=200):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        predict(row)
+    return (time.perf_counter() - start) / repeat
+
+
+def main():
+    from AI import customertraining, employeetraining
+
+    trainers = {'vip': customertraining, 'hire': employeetraining}
+    parser = argparse.ArgumentParser(description="Compile a trained VIP/hire pipeline into array form.")
+    parser.add_argument('model', choices=sorted(trainers))
+    parser.add_argument('--model-path', help="joblib pipeline (default: the trainer's MODEL_PATH)")
+    parser.add_argument('--output', help="compiled .npz (default: next to the model)")
+    parser.add_argument('--check', action='store_true',
+                        help="compare against the sklearn pipeline on the training data")
+    parser.add_argument('--data', help="CSV used by --check (default: the trainer's DATA_PATH)")
+    args = parser.parse_args()
+
+    trainer = trainers[args.model]
+    model_path = args.model_path or trainer.MODEL_PATH
+    compiled, output_path = export(model_path, args.output)
+    print(f"Compiled {len(compiled.roots)} trees ({len(compiled.feature):,} nodes, depth {compiled.max_depth}) "
+          f"to {output_path} ({os.path.getsize(output_path):,} bytes)")
+
+    if args.check:
+        import joblib
+        from services import datastore
+
+        pipeline = joblib.load(model_path)
+        X = datastore.read(args.data or trainer.DATA_PATH, trainer.FEATURES)
+        max_diff, mismatches = check(pipeline, compiled, X)
+        print(f"Parity on {len(X):,} rows: max |proba diff| = {max_diff:.2e}, class mismatches = {mismatches}")
+        # One form submission: sklearn needs a DataFrame, the compiled forest takes plain lists
+        sklearn_row = _single_row_seconds(pipeline.predict, X.iloc[:1])
+        compiled_row = _single_row_seconds(compiled.predict, X.iloc[:1].to_dict('list'))
+        print(f"Single-row latency: sklearn {sklearn_row * 1e3:.2f} ms, compiled {compiled_row * 1e3:.3f} ms "
+              f"({sklearn_row / compiled_row:.0f}x)")
+        if mismatches:
+            raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,10 @@
+import argparse
+import time
+
 import pandas as pd
 import numpy as np
 
-from AI.customertraining import accuracy
-
 # Settings
-np.random.seed(42)
 products = ['Smartphones', 'Laptops', 'Headphones', 'Tablets', 'Smartwatches']
 num_customers = 10000
 years = list(range(2005, 2025))
@@ -13,39 +13,82 @@ price_ranges = {'Smartphones': (200, 1000), 'Laptops': (500, 2000), 'Headphones'
                 'Tablets': (300, 800), 'Smartwatches': (150, 500)}
 product_weights = {'Smartphones': 0.4, 'Laptops': 0.2, 'Headphones': 0.25, 'Tablets': 0.1, 'Smartwatches': 0.05}
 
-data = []
-
-for customer_id in range(1, num_customers + 1):
-    num_purchases = np.random.randint(1, 21)
-    purchase_years = np.random.choice(years, size=num_purchases, replace=True)
-    purchase_years.sort()
-    first_year = min(purchase_years)
-    active_years = max(purchase_years) - first_year + 1 if purchase_years.size > 0 else 1
-
-    total_spend = 0
-    product_counts = {p: 0 for p in products}
-    for year in purchase_years:
-        product = np.random.choice(products, p=[product_weights[p] for p in products])
-        if product == 'Tablets' and year < 2010:
-            product = np.random.choice(['Smartphones', 'Laptops', 'Headphones'])
-        if product == 'Smartwatches' and year < 2015:
-            product = np.random.choice(['Smartphones', 'Laptops', 'Headphones'])
-        base_price = np.random.uniform(price_ranges[product][0], price_ranges[product][1])
-        price = base_price * (1 + 0.02) ** (year - 2005)
-        total_spend += price
-        product_counts[product] += 1
-
-    total_spend = round(total_spend, 2)
-    purchase_frequency = round(num_purchases / active_years, 2)
-    preferred_product = max(product_counts, key=product_counts.get)
-
-    is_vip = 1 if total_spend > 3000 or purchase_frequency > 1.5 else 0
-    if np.random.random() < 0.1:
-        is_vip = 1 - is_vip
-
-    data.append([customer_id, total_spend, purchase_frequency, preferred_product, is_vip])
-
-# Save dataset
-df = pd.DataFrame(data, columns=['CustomerID', 'TotalSpend', 'PurchaseFrequency', 'PreferredProduct', 'IsVIP'])
-df.to_csv('customer_behavior_vip.csv', index=False)
-print("Dataset saved as customer_behavior_vip.csv")
\ No newline at end of file
+# Lookup arrays indexed by product position in `products`
+_weights = np.array([product_weights[p] for p in products])
+_low = np.array([price_ranges[p][0] for p in products], dtype=float)
+_high = np.array([price_ranges[p][1] for p in products], dtype=float)
+_TABLETS = products.index('Tablets')
+_SMARTWATCHES = products.index('Smartwatches')
+_fallback = np.array([products.index(p) for p in ['Smartphones', 'Laptops', 'Headphones']])
+
+COLUMNS = ['CustomerID', 'TotalSpend', 'PurchaseFrequency', 'PreferredProduct', 'IsVIP']
+
+
+def generate_chunk(rng, n, first_id=1):
+    # Purchases for all n customers are laid out in one flat array, grouped by customer
+    num_purchases = rng.integers(1, 21, size=n)
+    customer = np.repeat(np.arange(n), num_purchases)
+    starts = np.cumsum(num_purchases) - num_purchases
+    total = customer.size
+
+    purchase_years = rng.integers(years[0], years[-1] + 1, size=total)
+    product = rng.choice(len(products), size=total, p=_weights)
+
+    # Tablets before 2010 and Smartwatches before 2015 did not exist yet
+    redirect = ((product == _TABLETS) & (purchase_years < 2010)) | \
+               ((product == _SMARTWATCHES) & (purchase_years < 2015))
+    product[redirect] = rng.choice(_fallback, size=int(redirect.sum()))
+
+    # Base price from the product's range, inflated 2% per year since 2005
+    price = rng.uniform(_low[product], _high[product]) * (1 + 0.02) ** (purchase_years - 2005)
+
+    total_spend = np.round(np.bincount(customer, weights=price, minlength=n), 2)
+    first_year = np.minimum.reduceat(purchase_years, starts)
+    last_year = np.maximum.reduceat(purchase_years, starts)
+    purchase_frequency = np.round(num_purchases / (last_year - first_year + 1), 2)
+
+    # Most purchased product; ties go to the earliest entry in `products`
+    counts = np.bincount(customer * len(products) + product, minlength=n * len(products))
+    preferred = counts.reshape(n, len(products)).argmax(axis=1)
+
+    is_vip = (total_spend > 3000) | (purchase_frequency > 1.5)
+    is_vip ^= rng.random(n) < 0.1
+
+    return pd.DataFrame({
+        'CustomerID': np.arange(first_id, first_id + n),
+        'TotalSpend': total_spend,
+        'PurchaseFrequency': purchase_frequency,
+        'PreferredProduct': np.asarray(products)[preferred],
+        'IsVIP': is_vip.astype(np.int8),
+    }, columns=COLUMNS)
+
+
+def generate_customers(n=num_customers, seed=42, chunksize=1000000):
+    # Yields DataFrames of at most `chunksize` customers so memory stays bounded
+    rng = np.random.default_rng(seed)
+    for first in range(0, n, chunksize):
+        size = min(chunksize, n - first)
+        yield generate_chunk(rng, size, first_id=first + 1)
+
+
+def write_customers(output, n=num_customers, seed=42, chunksize=1000000):
+    with open(output, 'w', newline='') as f:
+        for i, chunk in enumerate(generate_customers(n, seed, chunksize)):
+            chunk.to_csv(f, index=False, header=(i == 0))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a synthetic customer_behavior_vip.csv.")
+    parser.add_argument('--customers', type=int, default=num_customers)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--chunksize', type=int, default=1000000)
+    parser.add_argument('--output', default='customer_behavior_vip.csv')
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    write_customers(args.output, args.customers, args.seed, args.chunksize)
+    print(f"Dataset saved as {args.output} ({args.customers} customers in {time.perf_counter() - start:.2f}s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,57 +1,128 @@
+import os
+
 import pandas as pd
 import numpy as np
-from sklearn.ensemble import RandomForestClassifier
-from sklearn.preprocessing import OneHotEncoder
-from sklearn.compose import ColumnTransformer
-from sklearn.pipeline import Pipeline
 import joblib
 
+from AI.compiledforest import CompiledForest, compiled_path
+from AI.batchinput import finite, numeric
+from AI.trainingreport import StageTimer
+from services import datastore
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DATA_PATH = os.path.join(BASE_DIR, 'datasets', 'customer_behavior_vip.csv')
+MODEL_PATH = os.path.join(BASE_DIR, 'models', 'customervipcheck', 'vip_model.joblib')
+
 # Define products list
 products = ['Smartphones', 'Laptops', 'Headphones', 'Tablets', 'Smartwatches']
 
-# Load the dataset
-data = pd.read_csv('../datasets/customer_behavior_vip.csv')
+FEATURES = ['TotalSpend', 'PurchaseFrequency', 'PreferredProduct']
+TARGET = 'IsVIP'
+
+
+def build_model(n_jobs=None):
+    # sklearn is only imported when a model is actually built
+    from sklearn.ensemble import RandomForestClassifier
+    from sklearn.preprocessing import OneHotEncoder
+    from sklearn.compose import ColumnTransformer
+    from sklearn.pipeline import Pipeline
 
-# Step 1: Prepare features and target
-X = data[['TotalSpend', 'PurchaseFrequency', 'PreferredProduct']]
-y = data['IsVIP']
+    preprocessor = ColumnTransformer(
+        transformers=[
+            ('cat', OneHotEncoder(sparse_output=False, handle_unknown='ignore'), ['PreferredProduct']),
+            ('num', 'passthrough', ['TotalSpend', 'PurchaseFrequency'])
+        ])
 
-# Step 2: Create preprocessing pipeline
-preprocessor = ColumnTransformer(
-    transformers=[
-        ('cat', OneHotEncoder(sparse_output=False, handle_unknown='ignore'), ['PreferredProduct']),
-        ('num', 'passthrough', ['TotalSpend', 'PurchaseFrequency'])
+    return Pipeline([
+        ('preprocessor', preprocessor),
+        ('classifier', RandomForestClassifier(n_estimators=100, random_state=42, n_jobs=n_jobs))
     ])
 
-# Step 3: Create and train model pipeline
-model = Pipeline([
-    ('preprocessor', preprocessor),
-    ('classifier', RandomForestClassifier(n_estimators=100, random_state=42))
-])
-model.fit(X, y)
-
-# Step 4: Calculate accuracy
-accuracy = model.score(X, y)
-
-# Step 5: Save the model
-model_filename = '../models/customervipcheck/vip_model.joblib'
-joblib.dump(model, model_filename)
-
-# Step 6: Print model details
-feature_names = (model.named_steps['preprocessor']
-                 .named_transformers_['cat']
-                 .get_feature_names_out(['PreferredProduct'])
-                 .tolist() + ['TotalSpend', 'PurchaseFrequency'])
-importances = model.named_steps['classifier'].feature_importances_
-print("\nVIP Prediction Model:")
-for name, importance in zip(feature_names, importances):
-    print(f"Feature Importance: {name} = {importance:.4f}")
-print(f"Accuracy: {accuracy:.4f}")
-print(f"Model saved as: {model_filename}")
+
+def print_model_details(model, accuracy, model_filename):
+    feature_names = (model.named_steps['preprocessor']
+                     .named_transformers_['cat']
+                     .get_feature_names_out(['PreferredProduct'])
+                     .tolist() + ['TotalSpend', 'PurchaseFrequency'])
+    importances = model.named_steps['classifier'].feature_importances_
+    print("\nVIP Prediction Model:")
+    for name, importance in zip(feature_names, importances):
+        print(f"Feature Importance: {name} = {importance:.4f}")
+    print(f"Validation accuracy: {accuracy:.4f}")
+    print(f"Model saved as: {model_filename}")
+
+
+def train(data_path=DATA_PATH, model_path=MODEL_PATH, n_jobs=None, cv=0, validation_size=0.2):
+    # cv > 1: k-fold cross-validation (folds run in parallel).
+    # Otherwise: fit on a stratified split and score on the held-out validation rows.
+    # Either way the saved model is fit on all rows.
+    from sklearn.model_selection import cross_val_score, train_test_split
+
+    timer = StageTimer("VIP model")
+
+    # Step 1: Load the dataset
+    with timer.stage("load"):
+        data = datastore.read(data_path, FEATURES + [TARGET])
+
+    # Step 2: Prepare features and target
+    with timer.stage("preprocess"):
+        X, y = data[FEATURES], data[TARGET]
+        if cv <= 1:
+            X_train, X_val, y_train, y_val = train_test_split(
+                X, y, test_size=validation_size, random_state=42, stratify=y)
+        else:
+            X_train, y_train = X, y
+
+    # Step 3: Create and train model pipeline
+    model = build_model(n_jobs)
+    with timer.stage("fit"):
+        model.fit(X_train, y_train)
+
+    # Step 4: Calculate accuracy on data the model has not seen
+    with timer.stage("score"):
+        if cv > 1:
+            # Trees inside each fold stay single-threaded; the folds use the cores
+            scores = cross_val_score(build_model(1), X, y, cv=cv, n_jobs=n_jobs)
+            accuracy = scores.mean()
+        else:
+            accuracy = model.score(X_val, y_val)
+
+    # The holdout score is for the split model; ship one trained on every row
+    if cv <= 1:
+        model = build_model(n_jobs)
+        with timer.stage("refit"):
+            model.fit(X, y)
+
+    # Step 5: Save the model
+    with timer.stage("dump"):
+        os.makedirs(os.path.dirname(model_path), exist_ok=True)
+        joblib.dump(model, model_path)
+
+    # Array form of the same forest for the dashboard's single-row checks
+    with timer.stage("compile"):
+        CompiledForest.from_pipeline(model).save(compiled_path(model_path))
+
+    # Step 6: Print model details
+    print_model_details(model, accuracy, model_path)
+    timer.report(rows=len(data),
+                 validation=(f"{cv}-fold CV" if cv > 1 else
+                             f"{validation_size:.0%} holdout, scored on the {1 - validation_size:.0%} model"),
+                 accuracy=f"{accuracy:.4f}")
+    return model, accuracy
+
+
+_model = None
+
+
+def load_model(model_path=MODEL_PATH):
+    global _model
+    if _model is None:
+        _model = joblib.load(model_path)
+    return _model
 
 
 # Step 7: Prediction function
-def predict_vip(total_spend, purchase_frequency, preferred_product):
+def predict_vip(total_spend, purchase_frequency, preferred_product, model=None):
     # Validate inputs
     if not isinstance(total_spend, (int, float)) or total_spend < 0:
         return f"Error: TotalSpend must be a non-negative number, got {total_spend}"
@@ -60,6 +131,8 @@ def predict_vip(total_spend, purchase_frequency, preferred_product):
     if preferred_product not in products:
         return f"Error: Invalid product. Choose from {products}"
 
+    model = model if model is not None else load_model()
+
     # Create input DataFrame
     X_pred = pd.DataFrame({
         'TotalSpend': [total_spend],
@@ -73,6 +146,47 @@ def predict_vip(total_spend, purchase_frequency, preferred_product):
     return f"Prediction for customer (Spend=${total_spend:.2f}, Freq={purchase_frequency:.2f}/year, Product={preferred_product}): {'VIP' if is_vip else 'Non-VIP'}. {recommendation}"
 
 
+# Bit flags set in the 'error' field of predict_vip_batch() results
+ERROR_TOTAL_SPEND = 1
+ERROR_PURCHASE_FREQUENCY = 2
+ERROR_PREFERRED_PRODUCT = 4
+
+VIP_BATCH_DTYPE = np.dtype([('is_vip', np.bool_), ('vip_probability', np.float64), ('error', np.uint8)])
+
+
+def predict_vip_batch(total_spend, purchase_frequency, preferred_product, model=None):
+    # Same checks as predict_vip() over whole columns (arrays, lists or Series
+    # of equal length) and one predict_proba call for every valid row. Returns
+    # a VIP_BATCH_DTYPE record per row; rows with error != 0 are not scored
+    # and keep is_vip=False, vip_probability=NaN.
+    spend = numeric(total_spend)
+    frequency = numeric(purchase_frequency)
+    product = np.asarray(preferred_product, dtype=object).ravel()
+    if not len(spend) == len(frequency) == len(product):
+        raise ValueError("predict_vip_batch: input columns must have the same length")
+
+    result = np.zeros(len(spend), dtype=VIP_BATCH_DTYPE)
+    result['vip_probability'] = np.nan
+    error = result['error']
+    error[~(finite(spend) & (spend >= 0))] |= ERROR_TOTAL_SPEND
+    error[~(finite(frequency) & (frequency >= 0))] |= ERROR_PURCHASE_FREQUENCY
+    error[~np.isin(product, products)] |= ERROR_PREFERRED_PRODUCT
+
+    valid = error == 0
+    if valid.any():
+        model = model if model is not None else load_model()
+        X_pred = pd.DataFrame({
+            'TotalSpend': spend[valid],
+            'PurchaseFrequency': frequency[valid],
+            'PreferredProduct': product[valid]
+        })
+        proba = model.predict_proba(X_pred)
+        classes = np.asarray(model.classes_)
+        result['is_vip'][valid] = classes[proba.argmax(axis=1)] == 1
+        result['vip_probability'][valid] = proba[:, list(classes).index(1)]
+    return result
+
+
 # Step 8: Example usage with user input
 def get_user_prediction():
     try:
@@ -86,9 +200,13 @@ def get_user_prediction():
         print("Error: Please enter valid numeric values")
 
 
-# Run example predictions
-print("\nRunning example predictions:")
-print(predict_vip(4000, 2.0, 'Smartphones'))
-print(predict_vip(1000, 0.5, 'Headphones'))
-print(predict_vip(3500, 1.8, 'Laptops'))
+def run_examples(model=None):
+    print("\nRunning example predictions:")
+    print(predict_vip(4000, 2.0, 'Smartphones', model))
+    print(predict_vip(1000, 0.5, 'Headphones', model))
+    print(predict_vip(3500, 1.8, 'Laptops', model))
+
 
+if __name__ == "__main__":
+    model, _ = train()
+    run_examples(model)
@@ -1,46 +1,84 @@
+import argparse
+import time
+
 import pandas as pd
 import numpy as np
 
 # Settings
-np.random.seed(42)
 num_candidates = 5000
 education_levels = ['High School', 'Bachelor’s', 'Master’s', 'PhD']
 education_weights = [0.2, 0.5, 0.25, 0.05]
 
-data = []
+# Experience buckets: entry, mid, senior -> [low, high) ranges for YearsExperience
+experience_weights = [0.6, 0.3, 0.1]
+_experience_low = np.array([0, 5, 10])
+_experience_high = np.array([6, 11, 21])
+
+certification_counts = [0, 1, 2, 3, 4, 5]
+certification_weights = [0.5, 0.3, 0.15, 0.03, 0.01, 0.01]
+
+# Master's and PhD candidates
+_ADVANCED = np.array([False, False, True, True])
+
+COLUMNS = ['CandidateID', 'YearsExperience', 'EducationLevel', 'SkillScore', 'Certifications', 'ShouldHire']
 
-for candidate_id in range(1, num_candidates + 1):
+
+def generate_chunk(rng, n, first_id=1):
     # YearsExperience
-    experience_bucket = np.random.choice(['entry', 'mid', 'senior'], p=[0.6, 0.3, 0.1])
-    if experience_bucket == 'entry':
-        years_experience = np.random.randint(0, 6)
-    elif experience_bucket == 'mid':
-        years_experience = np.random.randint(5, 11)
-    else:
-        years_experience = np.random.randint(10, 21)
+    bucket = rng.choice(3, size=n, p=experience_weights)
+    years_experience = rng.integers(_experience_low[bucket], _experience_high[bucket])
 
     # EducationLevel
-    education_level = np.random.choice(education_levels, p=education_weights)
+    education = rng.choice(len(education_levels), size=n, p=education_weights)
+    advanced = _ADVANCED[education]
 
     # SkillScore
-    skill_mean = 70
-    if education_level in ['Master’s', 'PhD']:
-        skill_mean += 5
-    skill_score = round(np.clip(np.random.normal(skill_mean, 10), 0, 100), 2)
+    skill_mean = np.where(advanced, 75, 70)
+    skill_score = np.round(np.clip(rng.normal(skill_mean, 10), 0, 100), 2)
 
     # Certifications
-    certifications = np.random.choice([0, 1, 2, 3, 4, 5], p=[0.5, 0.3, 0.15, 0.03, 0.01, 0.01])
+    certifications = rng.choice(certification_counts, size=n, p=certification_weights)
 
     # ShouldHire
-    should_hire = 1 if (years_experience >= 5 or skill_score >= 80 or
-                        (education_level in ['Master’s', 'PhD'] and certifications >= 2)) else 0
-    if np.random.random() < 0.1:
-        should_hire = 1 - should_hire
-
-    data.append([candidate_id, years_experience, education_level, skill_score, certifications, should_hire])
-
-# Create DataFrame and save
-df = pd.DataFrame(data, columns=['CandidateID', 'YearsExperience', 'EducationLevel', 'SkillScore',
-                                 'Certifications', 'ShouldHire'])
-df.to_csv('employee_cv.csv', index=False)
-print("Dataset saved as employee_cv.csv")
\ No newline at end of file
+    should_hire = (years_experience >= 5) | (skill_score >= 80) | (advanced & (certifications >= 2))
+    should_hire ^= rng.random(n) < 0.1
+
+    return pd.DataFrame({
+        'CandidateID': np.arange(first_id, first_id + n),
+        'YearsExperience': years_experience,
+        'EducationLevel': np.asarray(education_levels)[education],
+        'SkillScore': skill_score,
+        'Certifications': certifications,
+        'ShouldHire': should_hire.astype(np.int8),
+    }, columns=COLUMNS)
+
+
+def generate_candidates(n=num_candidates, seed=42, chunksize=1000000):
+    # Yields DataFrames of at most `chunksize` candidates so memory stays bounded
+    rng = np.random.default_rng(seed)
+    for first in range(0, n, chunksize):
+        size = min(chunksize, n - first)
+        yield generate_chunk(rng, size, first_id=first + 1)
+
+
+def write_candidates(output, n=num_candidates, seed=42, chunksize=1000000):
+    with open(output, 'w', newline='', encoding='utf-8') as f:
+        for i, chunk in enumerate(generate_candidates(n, seed, chunksize)):
+            chunk.to_csv(f, index=False, header=(i == 0))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a synthetic employee_cv.csv.")
+    parser.add_argument('--candidates', type=int, default=num_candidates)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--chunksize', type=int, default=1000000)
+    parser.add_argument('--output', default='employee_cv.csv')
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    write_candidates(args.output, args.candidates, args.seed, args.chunksize)
+    print(f"Dataset saved as {args.output} ({args.candidates} candidates in {time.perf_counter() - start:.2f}s)")
+
+
+if __name__ == "__main__":
+    main()
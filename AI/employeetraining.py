@@ -1,57 +1,128 @@
+import os
+
 import pandas as pd
 import numpy as np
-from sklearn.ensemble import RandomForestClassifier
-from sklearn.preprocessing import OneHotEncoder
-from sklearn.compose import ColumnTransformer
-from sklearn.pipeline import Pipeline
 import joblib
 
+from AI.compiledforest import CompiledForest, compiled_path
+from AI.batchinput import finite, numeric
+from AI.trainingreport import StageTimer
+from services import datastore
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DATA_PATH = os.path.join(BASE_DIR, 'datasets', 'employee_cv.csv')
+MODEL_PATH = os.path.join(BASE_DIR, 'models', 'employeehire', 'hire_model.joblib')
+
 # Define valid education levels
 education_levels = ['High School', 'Bachelor’s', 'Master’s', 'PhD']
 
-# Load the dataset
-data = pd.read_csv('../datasets/employee_cv.csv')
+FEATURES = ['YearsExperience', 'EducationLevel', 'SkillScore', 'Certifications']
+TARGET = 'ShouldHire'
 
-# Step 1: Prepare features and target
-X = data[['YearsExperience', 'EducationLevel', 'SkillScore', 'Certifications']]
-y = data['ShouldHire']
 
-# Step 2: Create preprocessing pipeline
-preprocessor = ColumnTransformer(
-    transformers=[
-        ('cat', OneHotEncoder(sparse_output=False, handle_unknown='ignore'), ['EducationLevel']),
-        ('num', 'passthrough', ['YearsExperience', 'SkillScore', 'Certifications'])
+def build_model(n_jobs=None):
+    # sklearn is only imported when a model is actually built
+    from sklearn.ensemble import RandomForestClassifier
+    from sklearn.preprocessing import OneHotEncoder
+    from sklearn.compose import ColumnTransformer
+    from sklearn.pipeline import Pipeline
+
+    preprocessor = ColumnTransformer(
+        transformers=[
+            ('cat', OneHotEncoder(sparse_output=False, handle_unknown='ignore'), ['EducationLevel']),
+            ('num', 'passthrough', ['YearsExperience', 'SkillScore', 'Certifications'])
+        ])
+
+    return Pipeline([
+        ('preprocessor', preprocessor),
+        ('classifier', RandomForestClassifier(n_estimators=100, random_state=42, n_jobs=n_jobs))
     ])
 
-# Step 3: Create and train model pipeline
-model = Pipeline([
-    ('preprocessor', preprocessor),
-    ('classifier', RandomForestClassifier(n_estimators=100, random_state=42))
-])
-model.fit(X, y)
-
-# Step 4: Calculate accuracy
-accuracy = model.score(X, y)
-
-# Step 5: Save the model
-model_filename = '../models/employeehire/hire_model.joblib'
-joblib.dump(model, model_filename)
-
-# Step 6: Print model details
-feature_names = (model.named_steps['preprocessor']
-                 .named_transformers_['cat']
-                 .get_feature_names_out(['EducationLevel'])
-                 .tolist() + ['YearsExperience', 'SkillScore', 'Certifications'])
-importances = model.named_steps['classifier'].feature_importances_
-print("\nHiring Prediction Model:")
-for name, importance in zip(feature_names, importances):
-    print(f"Feature Importance: {name} = {importance:.4f}")
-print(f"Accuracy: {accuracy:.4f}")
-print(f"Model saved as: {model_filename}")
+
+def print_model_details(model, accuracy, model_filename):
+    feature_names = (model.named_steps['preprocessor']
+                     .named_transformers_['cat']
+                     .get_feature_names_out(['EducationLevel'])
+                     .tolist() + ['YearsExperience', 'SkillScore', 'Certifications'])
+    importances = model.named_steps['classifier'].feature_importances_
+    print("\nHiring Prediction Model:")
+    for name, importance in zip(feature_names, importances):
+        print(f"Feature Importance: {name} = {importance:.4f}")
+    print(f"Validation accuracy: {accuracy:.4f}")
+    print(f"Model saved as: {model_filename}")
+
+
+def train(data_path=DATA_PATH, model_path=MODEL_PATH, n_jobs=None, cv=0, validation_size=0.2):
+    # cv > 1: k-fold cross-validation (folds run in parallel).
+    # Otherwise: fit on a stratified split and score on the held-out validation rows.
+    # Either way the saved model is fit on all rows.
+    from sklearn.model_selection import cross_val_score, train_test_split
+
+    timer = StageTimer("Hire model")
+
+    # Step 1: Load the dataset
+    with timer.stage("load"):
+        data = datastore.read(data_path, FEATURES + [TARGET])
+
+    # Step 2: Prepare features and target
+    with timer.stage("preprocess"):
+        X, y = data[FEATURES], data[TARGET]
+        if cv <= 1:
+            X_train, X_val, y_train, y_val = train_test_split(
+                X, y, test_size=validation_size, random_state=42, stratify=y)
+        else:
+            X_train, y_train = X, y
+
+    # Step 3: Create and train model pipeline
+    model = build_model(n_jobs)
+    with timer.stage("fit"):
+        model.fit(X_train, y_train)
+
+    # Step 4: Calculate accuracy on data the model has not seen
+    with timer.stage("score"):
+        if cv > 1:
+            # Trees inside each fold stay single-threaded; the folds use the cores
+            scores = cross_val_score(build_model(1), X, y, cv=cv, n_jobs=n_jobs)
+            accuracy = scores.mean()
+        else:
+            accuracy = model.score(X_val, y_val)
+
+    # The holdout score is for the split model; ship one trained on every row
+    if cv <= 1:
+        model = build_model(n_jobs)
+        with timer.stage("refit"):
+            model.fit(X, y)
+
+    # Step 5: Save the model
+    with timer.stage("dump"):
+        os.makedirs(os.path.dirname(model_path), exist_ok=True)
+        joblib.dump(model, model_path)
+
+    # Array form of the same forest for the dashboard's single-row checks
+    with timer.stage("compile"):
+        CompiledForest.from_pipeline(model).save(compiled_path(model_path))
+
+    # Step 6: Print model details
+    print_model_details(model, accuracy, model_path)
+    timer.report(rows=len(data),
+                 validation=(f"{cv}-fold CV" if cv > 1 else
+                             f"{validation_size:.0%} holdout, scored on the {1 - validation_size:.0%} model"),
+                 accuracy=f"{accuracy:.4f}")
+    return model, accuracy
+
+
+_model = None
+
+
+def load_model(model_path=MODEL_PATH):
+    global _model
+    if _model is None:
+        _model = joblib.load(model_path)
+    return _model
 
 
 # Step 7: Prediction function
-def predict_hire(years_experience, education_level, skill_score, certifications):
+def predict_hire(years_experience, education_level, skill_score, certifications, model=None):
 
     if not isinstance(years_experience, (int, float)) or years_experience < 0:
         return f"Error: YearsExperience must be a non-negative number, got {years_experience}"
@@ -62,6 +133,8 @@ def predict_hire(years_experience, education_level, skill_score, certifications)
     if not isinstance(certifications, int) or certifications < 0:
         return f"Error: Certifications must be a non-negative integer, got {certifications}"
 
+    model = model if model is not None else load_model()
+
     # Create input DataFrame
     X_pred = pd.DataFrame({
         'YearsExperience': [years_experience],
@@ -78,6 +151,63 @@ def predict_hire(years_experience, education_level, skill_score, certifications)
             f"{'Hire' if should_hire else 'Not Hire'}. {recommendation}")
 
 
+# Bit flags set in the 'error' field of predict_hire_batch() results
+ERROR_YEARS_EXPERIENCE = 1
+ERROR_EDUCATION_LEVEL = 2
+ERROR_SKILL_SCORE = 4
+ERROR_CERTIFICATIONS = 8
+
+ERROR_MESSAGES = {
+    ERROR_YEARS_EXPERIENCE: "YearsExperience must be a non-negative number",
+    ERROR_EDUCATION_LEVEL: f"EducationLevel must be one of {education_levels}",
+    ERROR_SKILL_SCORE: "SkillScore must be between 0 and 100",
+    ERROR_CERTIFICATIONS: "Certifications must be a non-negative integer",
+}
+
+HIRE_BATCH_DTYPE = np.dtype([('should_hire', np.bool_), ('hire_probability', np.float64), ('error', np.uint8)])
+
+
+def describe_errors(error):
+    # 'error' bit field of one predict_hire_batch() record -> readable message
+    return "; ".join(message for flag, message in ERROR_MESSAGES.items() if error & flag)
+
+
+def predict_hire_batch(years_experience, education_level, skill_score, certifications, model=None):
+    # Same checks as predict_hire() over whole columns (arrays, lists or Series
+    # of equal length) and one predict_proba call for every valid row. Returns
+    # a HIRE_BATCH_DTYPE record per row; rows with error != 0 are not scored
+    # and keep should_hire=False, hire_probability=NaN.
+    experience = numeric(years_experience)
+    education = np.asarray(education_level, dtype=object).ravel()
+    skill = numeric(skill_score)
+    certs = numeric(certifications)
+    if not len(experience) == len(education) == len(skill) == len(certs):
+        raise ValueError("predict_hire_batch: input columns must have the same length")
+
+    result = np.zeros(len(experience), dtype=HIRE_BATCH_DTYPE)
+    result['hire_probability'] = np.nan
+    error = result['error']
+    error[~(finite(experience) & (experience >= 0))] |= ERROR_YEARS_EXPERIENCE
+    error[~np.isin(education, education_levels)] |= ERROR_EDUCATION_LEVEL
+    error[~(finite(skill) & (skill >= 0) & (skill <= 100))] |= ERROR_SKILL_SCORE
+    error[~(finite(certs) & (certs >= 0) & (certs == np.floor(certs)))] |= ERROR_CERTIFICATIONS
+
+    valid = error == 0
+    if valid.any():
+        model = model if model is not None else load_model()
+        X_pred = pd.DataFrame({
+            'YearsExperience': experience[valid],
+            'EducationLevel': education[valid],
+            'SkillScore': skill[valid],
+            'Certifications': certs[valid]
+        })
+        proba = model.predict_proba(X_pred)
+        classes = np.asarray(model.classes_)
+        result['should_hire'][valid] = classes[proba.argmax(axis=1)] == 1
+        result['hire_probability'][valid] = proba[:, list(classes).index(1)]
+    return result
+
+
 # Step 8: Example usage with user input
 def get_user_prediction():
     try:
@@ -92,8 +222,13 @@ def get_user_prediction():
         print("Error: Please enter valid numeric values where required")
 
 
-# Run example predictions
-print("\nRunning example predictions:")
-print(predict_hire(7, 'Master’s', 85, 2))
-print(predict_hire(1, 'High School', 60, 0))
-print(predict_hire(5, 'Bachelor’s', 75, 1))
+def run_examples(model=None):
+    print("\nRunning example predictions:")
+    print(predict_hire(7, 'Master’s', 85, 2, model))
+    print(predict_hire(1, 'High School', 60, 0, model))
+    print(predict_hire(5, 'Bachelor’s', 75, 1, model))
+
+
+if __name__ == "__main__":
+    model, _ = train()
+    run_examples(model)
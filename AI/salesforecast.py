@@ -0,0 +1,83 @@
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+
+# The sales models are LinearRegression on (Year, Month), so a forecast is
+# intercept + a*Year + b*Month. Pulling the coefficients out once lets a whole
+# products x months horizon be computed as a single matrix product.
+
+FEATURES = ['Year', 'Month']
+
+# Range offered by the Future Trends page, precomputed at training time
+FORECAST_YEARS = range(2025, 2031)
+TABLE_FILENAME = 'forecast_table.csv'
+
+
+def extract_coefficients(models):
+    # models: {product: fitted LinearRegression}; returns products, (P, 2) weights, (P,) intercepts
+    products = list(models)
+    coef = np.empty((len(products), len(FEATURES)))
+    intercept = np.empty(len(products))
+    for i, product in enumerate(products):
+        model = models[product]
+        names = list(getattr(model, 'feature_names_in_', FEATURES))
+        weights = np.ravel(model.coef_)
+        coef[i] = [weights[names.index(feature)] for feature in FEATURES]
+        intercept[i] = np.ravel(model.intercept_)[0]
+    return products, coef, intercept
+
+
+def horizon(years, months=range(1, 13)):
+    # Every (year, month) pair in calendar order, as a (T, 2) array
+    year_grid, month_grid = np.meshgrid(np.asarray(years), np.asarray(months), indexing='ij')
+    return np.column_stack([year_grid.ravel(), month_grid.ravel()])
+
+
+def forecast(coef, intercept, periods):
+    # (P, 2) @ (2, T) + (P, 1) -> (P, T)
+    return coef @ np.asarray(periods, dtype=float).T + intercept[:, None]
+
+
+def forecast_grid(models, years, months=range(1, 13)):
+    products, coef, intercept = extract_coefficients(models)
+    periods = horizon(years, months)
+    values = forecast(coef, intercept, periods)
+    columns = [period_key(year, month) for year, month in periods]
+    return pd.DataFrame(values, index=pd.Index(products, name='Product'), columns=columns)
+
+
+def period_key(year, month):
+    return f"{year}-{month:02d}"
+
+
+def write_forecast_table(models, path, years=FORECAST_YEARS):
+    table = forecast_grid(models, years).round(2)
+    table.to_csv(path)
+    return table
+
+
+_table_lock = threading.Lock()
+_tables = {}
+
+
+def get_forecast_table(path):
+    # Parsed once per process and kept in memory; re-read if the file is rewritten
+    if not os.path.exists(path):
+        return None
+    mtime_ns = os.stat(path).st_mtime_ns
+    with _table_lock:
+        cached = _tables.get(path)
+        if cached is None or cached[0] != mtime_ns:
+            cached = (mtime_ns, pd.read_csv(path, index_col='Product'))
+            _tables[path] = cached
+        return cached[1]
+
+
+def lookup(table, product, year, month):
+    # Precomputed value, or None when the product/period is outside the table
+    key = period_key(year, month)
+    if table is None or product not in table.index or key not in table.columns:
+        return None
+    return table.at[product, key]
@@ -1,68 +1,115 @@
-from sklearn.linear_model import LinearRegression
+import json
+import os
 
 import pandas as pd
 import numpy as np
-from sklearn.ensemble import RandomForestRegressor
 import joblib
+from joblib import Parallel, delayed
+
+from AI import salesforecast
+from AI.batchinput import numeric
+from AI.trainingreport import StageTimer
+from services import datastore
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DATA_PATH = os.path.join(BASE_DIR, 'datasets', 'electronics_sales.csv')
+MODEL_DIR = os.path.join(BASE_DIR, 'models', 'sales')
+
+# Product name -> model file, written next to the models
+MANIFEST = 'products.json'
+
+
+def model_path(product_name, model_dir=MODEL_DIR):
+    return os.path.join(model_dir, f"{product_name.lower()}_model.joblib")
 
-# Load the dataset
-data = pd.read_csv('../datasets/electronics_sales.csv')  # Replace with 'train.csv' if needed
-
-# Step 1: Create separate DataFrames for each product
-phones = data[data['Product'] == 'Smartphones'].copy()
-laptops = data[data['Product'] == 'Laptops'].copy()
-headphones = data[data['Product'] == 'Headphones'].copy()
-tablets = data[data['Product'] == 'Tablets'].copy()
-smartwatches = data[data['Product'] == 'Smartwatches'].copy()
-
-# Step 2: Train Random Forest models, save them, and store them
-dfs = [
-    (phones, 'Smartphones'),
-    (laptops, 'Laptops'),
-    (headphones, 'Headphones'),
-    (tablets, 'Tablets'),
-    (smartwatches, 'Smartwatches')
-]
-
-# Dictionary to store models
-models = {}
 
-for df, product_name in dfs:
-    # Feature engineering
-    df['Date'] = pd.to_datetime(df['Date'])
-    df['Year'] = df['Date'].dt.year
-    df['Month'] = df['Date'].dt.month
+def prepare(data):
+    # Parse Date once for the whole table
+    date = pd.to_datetime(data['Date'])
+    data = data.assign(Year=date.dt.year.astype(np.int32), Month=date.dt.month.astype(np.int32))
+    return data[['Product', 'Year', 'Month', 'Sales']]
+
+
+def fit_product(product_name, df, model_dir=MODEL_DIR):
+    from sklearn.linear_model import LinearRegression
 
     # Prepare features (X) and target (y)
     X = df[['Year', 'Month']]
     y = df['Sales']
 
-    # Train Random Forest model
-    # model = RandomForestRegressor(n_estimators=100, random_state=42)
     model = LinearRegression()
     model.fit(X, y)
 
-    # Calculate R² score
-    r2_score = model.score(X, y)
-
     # Save the model to a file
-    model_filename = f"{product_name.lower()}_model.joblib"
+    model_filename = model_path(product_name, model_dir)
     joblib.dump(model, model_filename)
+    return product_name, model, model_filename
+
+
+def train(data_path=DATA_PATH, model_dir=MODEL_DIR, n_jobs=None):
+    timer = StageTimer("Sales models")
+
+    # Step 1: Load the dataset
+    with timer.stage("load"):
+        data = datastore.read(data_path, ['Date', 'Product', 'Sales'])
+
+    # Step 2: Feature engineering, then one groupby pass splits rows per product
+    with timer.stage("preprocess"):
+        data = prepare(data)
+        groups = list(data.groupby('Product', sort=True))
+
+    # Step 3: Fit and save one model per product, products in parallel
+    os.makedirs(model_dir, exist_ok=True)
+    with timer.stage("fit+dump"):
+        results = Parallel(n_jobs=n_jobs)(
+            delayed(fit_product)(product_name, df, model_dir) for product_name, df in groups
+        )
+
+    # Step 4: Record which products have models
+    trained = {}
+    with timer.stage("manifest"):
+        for product_name, model, model_filename in results:
+            trained[product_name] = model
+            print(f"\nModel for {product_name}:")
+            print(f"Model saved as: {model_filename}")
+        with open(os.path.join(model_dir, MANIFEST), 'w') as f:
+            json.dump({name: os.path.basename(model_path(name, model_dir)) for name in trained}, f, indent=2)
+
+    # Step 5: Precompute the forecast grid served by the Future Trends page
+    with timer.stage("forecast"):
+        table_path = os.path.join(model_dir, salesforecast.TABLE_FILENAME)
+        salesforecast.write_forecast_table(trained, table_path)
+        print(f"\nForecast table saved as: {table_path}")
+
+    timer.report(rows=len(data), products=len(trained))
+    models.clear()
+    models.update(trained)
+    return trained
+
+
+# Models by product, filled by train() or lazily from MODEL_DIR
+models = {}
 
-    # Store model in dictionary
-    models[product_name] = model
 
-    # Print model details
-    print(f"\nModel for {product_name}:")
-    # print(
-    #     f"Feature Importances: Year = {model.feature_importances_[0]:.4f}, Month = {model.feature_importances_[1]:.4f}")
-    # print(f"R² Score: {r2_score:.4f}")
-    print(f"Model saved as: {model_filename}")
+def load_models(model_dir=MODEL_DIR):
+    if not models:
+        manifest_path = os.path.join(model_dir, MANIFEST)
+        if os.path.exists(manifest_path):
+            with open(manifest_path) as f:
+                files = json.load(f)
+        else:
+            files = {filename[:-len('_model.joblib')].capitalize(): filename
+                     for filename in sorted(os.listdir(model_dir)) if filename.endswith('_model.joblib')}
+        for product, filename in files.items():
+            models[product] = joblib.load(os.path.join(model_dir, filename))
+    return models
 
 
 # Step 3: Prediction function
 def predict_sales(month, year, product):
 
+    load_models()
+
     if not isinstance(month, int) or month < 1 or month > 12:
         return f"Error: Month must be an integer between 1 and 12, got {month}"
     if not isinstance(year, int):
@@ -80,6 +127,44 @@ def predict_sales(month, year, product):
     return round(prediction, 2)
 
 
+# Bit flags set in the 'error' field of predict_sales_batch() results
+ERROR_MONTH = 1
+ERROR_YEAR = 2
+ERROR_PRODUCT = 4
+
+SALES_BATCH_DTYPE = np.dtype([('sales', np.float64), ('error', np.uint8)])
+
+
+def predict_sales_batch(month, year, product):
+    # Same checks as predict_sales() over whole columns (arrays, lists or
+    # Series of equal length). Each model is intercept + a*Year + b*Month, so
+    # every valid row is one gathered dot product. Returns a SALES_BATCH_DTYPE
+    # record per row; rows with error != 0 keep sales=NaN.
+    load_models()
+
+    month = numeric(month)
+    year = numeric(year)
+    product = np.asarray(product, dtype=object).ravel()
+    if not len(month) == len(year) == len(product):
+        raise ValueError("predict_sales_batch: input columns must have the same length")
+
+    names, coef, intercept = salesforecast.extract_coefficients(models)
+    codes = pd.Index(names).get_indexer(product)
+
+    result = np.zeros(len(month), dtype=SALES_BATCH_DTYPE)
+    result['sales'] = np.nan
+    error = result['error']
+    error[~(np.isfinite(month) & (month >= 1) & (month <= 12) & (month == np.floor(month)))] |= ERROR_MONTH
+    error[~(np.isfinite(year) & (year == np.floor(year)))] |= ERROR_YEAR
+    error[codes < 0] |= ERROR_PRODUCT
+
+    valid = error == 0
+    periods = np.column_stack([year[valid], month[valid]])
+    codes = codes[valid]
+    result['sales'][valid] = np.round((coef[codes] * periods).sum(axis=1) + intercept[codes], 2)
+    return result
+
+
 # Step 4: Example usage with user input
 def get_user_prediction():
     try:
@@ -96,8 +181,13 @@ def get_user_prediction():
         print("Error: Please enter valid numeric values for month and year")
 
 
-# Run example predictions
-print("\nRunning example predictions:")
-print(f"Smartphones, Jan 2025: {predict_sales(1, 2025, 'Smartphones')} units")
-print(f"Laptops, Dec 2025: {predict_sales(12, 2025, 'Laptops')} units")
-print(f"Headphones, Jun 2024: {predict_sales(6, 2024, 'Headphones')} units")
+def run_examples():
+    print("\nRunning example predictions:")
+    print(f"Smartphones, Jan 2025: {predict_sales(1, 2025, 'Smartphones')} units")
+    print(f"Laptops, Dec 2025: {predict_sales(12, 2025, 'Laptops')} units")
+    print(f"Headphones, Jun 2024: {predict_sales(6, 2024, 'Headphones')} units")
+
+
+if __name__ == "__main__":
+    train()
+    run_examples()
@@ -0,0 +1,76 @@
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+
+from AI import customertraining, employeetraining, salestraining
+
+# Run from the repository root:  python -m AI.train {vip,hire,sales,all} [options]
+
+
+def train_vip(args):
+    customertraining.train(args.data or customertraining.DATA_PATH,
+                           args.model or customertraining.MODEL_PATH,
+                           args.n_jobs, args.cv, args.validation_size)
+
+
+def train_hire(args):
+    employeetraining.train(args.data or employeetraining.DATA_PATH,
+                           args.model or employeetraining.MODEL_PATH,
+                           args.n_jobs, args.cv, args.validation_size)
+
+
+def train_sales(args):
+    salestraining.train(args.data or salestraining.DATA_PATH,
+                        args.model_dir or salestraining.MODEL_DIR,
+                        args.n_jobs)
+
+
+TRAINERS = {'vip': train_vip, 'hire': train_hire, 'sales': train_sales}
+
+
+def train_all(args):
+    # Each model trains in its own process with the default paths
+    defaults = argparse.Namespace(data=None, model=None, model_dir=None, n_jobs=args.n_jobs,
+                                  cv=args.cv, validation_size=args.validation_size)
+    with ProcessPoolExecutor(max_workers=len(TRAINERS)) as pool:
+        futures = [pool.submit(trainer, defaults) for trainer in TRAINERS.values()]
+        for future in futures:
+            future.result()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Train the SYS MART models.")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    vip = subparsers.add_parser('vip', help="VIP customer classifier")
+    vip.add_argument('--data', help="customer_behavior_vip.csv path")
+    vip.add_argument('--model', help="output .joblib path")
+    vip.set_defaults(func=train_vip)
+
+    hire = subparsers.add_parser('hire', help="candidate hiring classifier")
+    hire.add_argument('--data', help="employee_cv.csv path")
+    hire.add_argument('--model', help="output .joblib path")
+    hire.set_defaults(func=train_hire)
+
+    sales = subparsers.add_parser('sales', help="per-product sales regressors")
+    sales.add_argument('--data', help="electronics_sales.csv path")
+    sales.add_argument('--model-dir', help="output directory for <product>_model.joblib files")
+    sales.set_defaults(func=train_sales)
+
+    all_models = subparsers.add_parser('all', help="train every model in parallel with default paths")
+    all_models.set_defaults(func=train_all)
+
+    for subparser in (vip, hire, sales, all_models):
+        subparser.add_argument('--n-jobs', type=int, default=-1,
+                               help="cores per estimator (default -1 uses all cores)")
+    for subparser in (vip, hire, all_models):
+        subparser.add_argument('--cv', type=int, default=0,
+                               help="k-fold cross-validation instead of a holdout split")
+        subparser.add_argument('--validation-size', type=float, default=0.2,
+                               help="holdout fraction when --cv is not given")
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
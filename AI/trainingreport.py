@@ -0,0 +1,30 @@
+import time
+from contextlib import contextmanager
+
+
+class StageTimer:
+    # Collects wall-clock time per training stage (load, preprocess, fit, score, refit, dump)
+
+    def __init__(self, name):
+        self.name = name
+        self.stages = []
+
+    @contextmanager
+    def stage(self, label):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stages.append((label, time.perf_counter() - start))
+
+    def total(self):
+        return sum(seconds for _, seconds in self.stages)
+
+    def report(self, **metrics):
+        print(f"\n{self.name} training report:")
+        for label, seconds in self.stages:
+            print(f"  {label:<10} {seconds:8.3f}s")
+        print(f"  {'total':<10} {self.total():8.3f}s")
+        for key, value in metrics.items():
+            print(f"  {key}: {value}")
+        return {"stages": dict(self.stages), "total": self.total(), **metrics}
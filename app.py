@@ -1,60 +1,30 @@
 import streamlit as st
-import pandas as pd
-import joblib
-from pymongo import MongoClient
-from fpdf import FPDF
 import time
 import traceback
 import sys
 
-
-
-# Sales Data Calculations
-electronic_sales = pd.read_csv('datasets/electronics_sales_updated.csv')
-
-smartphone_cost = 40000
-laptop_cost = 75000
-tablet_cost = 30000
-headphones_cost = 10000
-smartwatch_cost = 5000
-
-total_orders = sum(electronic_sales['Sales'])
-
-total_smartphone_sales = electronic_sales[electronic_sales["Product"] == "Smartphones"]["Sales"].sum()
-total_laptop_sales = electronic_sales[electronic_sales["Product"] == "Laptops"]["Sales"].sum()
-total_tablet_sales = electronic_sales[electronic_sales["Product"] == "Tablets"]["Sales"].sum()
-total_headphones_sales = electronic_sales[electronic_sales["Product"] == "Headphones"]["Sales"].sum()
-total_smartwatch_sales = electronic_sales[electronic_sales["Product"] == "Smartwatches"]["Sales"].sum() if "Smartwatches" in electronic_sales["Product"].unique() else 0
-
-total_revenue_cpy = (
-    total_smartphone_sales * smartphone_cost +
-    total_laptop_sales * laptop_cost +
-    total_tablet_sales * tablet_cost +
-    total_headphones_sales * headphones_cost +
-    total_smartwatch_sales * smartwatch_cost
-)
-
-total_revenue = total_revenue_cpy // 10000000
-
-# Customer Data
-customers = pd.read_csv('datasets/customer_behavior_vip.csv')
-num_customers = len(customers)
-
-# Average Order Value
-avg_order = round(total_revenue_cpy / num_customers, 2)
-
-# Stock Management
-stock = pd.read_csv('datasets/item_stock_dataset.csv')
-laptops_stock = stock.loc[stock['item'] == 'Laptops', 'stock'].values[0]
-tablets_stock = stock.loc[stock['item'] == 'Tablets', 'stock'].values[0]
-mobiles_stock = stock.loc[stock['item'] == 'Mobiles', 'stock'].values[0]
-smartwatches_stock = stock.loc[stock['item'] == 'Smartwatches', 'stock'].values[0]
-headphones_stock = stock.loc[stock['item'] == 'Headphones', 'stock'].values[0]
-
-# MongoDB Setup
-client = MongoClient("mongodb://localhost:27017")
-db = client["shop_app"]
-users_collection = db["users"]
+from services import startupprofile
+
+# Heavy libraries and data are loaded by each page on its first visit, so the
+# login screen only pays for Streamlit itself.
+_script_start = time.perf_counter()
+
+FORECAST_TABLE_PATH = 'models/sales/forecast_table.csv'
+
+# Modules each page needs; imported lazily (and timed in startup profile mode)
+PAGE_IMPORTS = {
+    "login": ["services.userstore"],
+    "register": ["services.userstore"],
+    "overview": ["services.kpiengine", "services.stockledger"],
+    "stock": ["services.stockledger"],
+    "future_trends": ["AI.salesforecast", "services.modelregistry", "joblib", "sklearn.linear_model"],
+    "employees": ["pandas", "AI.employeetraining", "services.employeestore", "services.modelregistry",
+                  "AI.compiledforest"],
+    "generate_bill": ["pandas", "fpdf", "services.billarchive", "services.billing", "services.stockledger"],
+    "vip_customers": ["pandas", "services.catalog", "services.modelregistry", "services.viplog",
+                      "AI.compiledforest"],
+    "settings": [],
+}
 
 # Streamlit Page Config
 st.set_page_config(layout="wide")
@@ -66,21 +36,20 @@ if "page" not in st.session_state:
     st.session_state.page = "login"
 if "dashboard_page" not in st.session_state:
     st.session_state.dashboard_page = "overview"
-if "employees" not in st.session_state:
-    st.session_state.employees = pd.read_csv('datasets/employee_dataset.csv')
-
-# Function to generate PDF bill
-def generate_bill_pdf(customer_name, product, quantity, price_per_unit, total_cost):
-    pdf = FPDF()
-    pdf.add_page()
-    pdf.set_font("Arial", size=12)
-    pdf.cell(200, 10, txt="SYS MART", ln=1, align='C')
-    pdf.cell(200, 10, txt=f"Customer: {customer_name}", ln=1, align='L')
-    pdf.cell(200, 10, txt=f"Product: {product}", ln=1, align='L')
-    pdf.cell(200, 10, txt=f"Quantity: {quantity}", ln=1, align='L')
-    pdf.cell(200, 10, txt=f"Price per Unit: Rs. {price_per_unit:,}", ln=1, align='L')
-    pdf.cell(200, 10, txt=f"Total Cost: Rs. {total_cost:,}", ln=1, align='L')
-    return pdf.output(dest='S').encode('latin1')
+
+
+def render_page(page):
+    if not startupprofile.ENABLED:
+        PAGES[page]()
+        return
+    startupprofile.import_modules(page, PAGE_IMPORTS[page])
+    start = time.perf_counter()
+    PAGES[page]()
+    startupprofile.record_render(page, time.perf_counter() - start)
+    with st.sidebar.expander("Startup profile"):
+        st.write(f"Script start to render: {time.perf_counter() - _script_start:.3f}s")
+        st.table(startupprofile.report())
+
 
 # Home Dashboard
 def show_home():
@@ -218,508 +187,693 @@ def show_home():
         st.markdown("</div>", unsafe_allow_html=True)
 
     # Dashboard Content
-    if st.session_state.dashboard_page == "overview":
-        html_content = f"""
-            <div class='main-content'>
-                <h2>📊 Dashboard Overview</h2>
-                <div class='stats-container'>
-                    <div class='stat-card'>
-                        <h3>Total Revenue</h3>
-                        <p>₹{total_revenue} crores</p>
-                    </div>
-                    <div class='stat-card'>
-                        <h3>Total Orders</h3>
-                        <p>{total_orders}</p>
-                    </div>
-                    <div class='stat-card'>
-                        <h3>Total Unique Customers</h3>
-                        <p>{num_customers}</p>
-                    </div>
-                    <div class='stat-card'>
-                        <h3>Avg. Order Value</h3>
-                        <p>₹{avg_order}</p>
-                    </div>
+    render_page(st.session_state.dashboard_page)
+
+
+def show_low_stock_alerts(stockledger):
+    for alert in stockledger.low_stock():
+        st.warning(f"⚠️ Low stock: {alert['item']} has {alert['quantity']} left "
+                   f"(reorder level {alert['reorder_level']}).")
+
+
+# Overview Page
+def page_overview():
+    from services import stockledger
+    from services.kpiengine import get_kpis
+
+    kpis = get_kpis()
+    stock_levels = stockledger.snapshot()
+    html_content = f"""
+        <div class='main-content'>
+            <h2>📊 Dashboard Overview</h2>
+            <div class='stats-container'>
+                <div class='stat-card'>
+                    <h3>Total Revenue</h3>
+                    <p>₹{kpis['total_revenue']} crores</p>
                 </div>
-                <h2>Stocks Overview</h2>
-                <div class='stock-container'>
-                    <div class='stock-card'>
-                        <h3>Total Stocks Available</h3>
-                        <ul class='stock-list'>
-                            <li>Laptops: {laptops_stock}</li>
-                            <li>Tablets: {tablets_stock}</li>
-                            <li>Mobiles: {mobiles_stock}</li>
-                            <li>Smartwatches: {smartwatches_stock}</li>
-                            <li>Headphones: {headphones_stock}</li>
-                        </ul>
-                    </div>
+                <div class='stat-card'>
+                    <h3>Total Orders</h3>
+                    <p>{kpis['total_orders']}</p>
+                </div>
+                <div class='stat-card'>
+                    <h3>Total Unique Customers</h3>
+                    <p>{kpis['num_customers']}</p>
+                </div>
+                <div class='stat-card'>
+                    <h3>Avg. Order Value</h3>
+                    <p>₹{kpis['avg_order']}</p>
                 </div>
             </div>
-        """
-        st.markdown(html_content, unsafe_allow_html=True)
-    elif st.session_state.dashboard_page == "stock":
-        html_content = f"""
-            <div class='main-content'>
-                <h2>🛒 Stock</h2>
+            <h2>Stocks Overview</h2>
+            <div class='stock-container'>
+                <div class='stock-card'>
+                    <h3>Total Stocks Available</h3>
+                    <ul class='stock-list'>
+                        <li>Laptops: {stock_levels['Laptops']}</li>
+                        <li>Tablets: {stock_levels['Tablets']}</li>
+                        <li>Mobiles: {stock_levels['Mobiles']}</li>
+                        <li>Smartwatches: {stock_levels['Smartwatches']}</li>
+                        <li>Headphones: {stock_levels['Headphones']}</li>
+                    </ul>
+                </div>
+            </div>
+        </div>
+    """
+    st.markdown(html_content, unsafe_allow_html=True)
+    show_low_stock_alerts(stockledger)
+
+
+# Stock Page
+def page_stock():
+    from services import stockledger
+
+    stock_levels = stockledger.snapshot()
+    html_content = f"""
+        <div class='main-content'>
+            <h2>🛒 Stock</h2>
+            <div class='stock-container'>
+                <div class='stock-card'>
+                    <h3>Current Stock Levels</h3>
+                    <ul class='stock-list'>
+                        <li>Laptops: {stock_levels['Laptops']}</li>
+                        <li>Tablets: {stock_levels['Tablets']}</li>
+                        <li>Mobiles: {stock_levels['Mobiles']}</li>
+                        <li>Smartwatches: {stock_levels['Smartwatches']}</li>
+                        <li>Headphones: {stock_levels['Headphones']}</li>
+                    </ul>
+                </div>
+            </div>
+        </div>
+    """
+    st.markdown(html_content, unsafe_allow_html=True)
+    show_low_stock_alerts(stockledger)
+
+    with st.form(key="add_stock_form"):
+        item = st.selectbox("Select Item", ["Laptops", "Tablets", "Mobiles", "Smartwatches", "Headphones"])
+        quantity = st.number_input("Enter Quantity to Add", min_value=1, step=1, value=1)
+        submit_button = st.form_submit_button(label="Add Stock")
+
+    if submit_button:
+        try:
+            stockledger.add(item, quantity)
+            st.success(f"✅ Successfully added {quantity} units to {item} stock.")
+        except stockledger.StockError as e:
+            st.error(str(e))
+        st.rerun()
+
+    with st.expander("Recent stock movements"):
+        st.dataframe(stockledger.history(limit=50), hide_index=True)
+
+
+# Future Trends Page
+def page_future_trends():
+    from AI.salesforecast import FORECAST_YEARS, forecast_grid, get_forecast_table, lookup
+    from services import modelregistry
+
+    html_content = f"""
+        <div class='main-content'>
+            <h2>🛍️ Future Trends</h2>
+            <div class='stock-container'>
+                <div class='stock-card'>
+                    <h3>Future Sales Prediction</h3>
+                </div>
+            </div>
+        </div>
+    """
+    st.markdown(html_content, unsafe_allow_html=True)
+
+    with st.form(key="future_trends_form"):
+        product = st.selectbox("Select Product", ["Headphones", "Laptops", "Smartphones", "Smartwatches", "Tablets"])
+        month = st.number_input("Enter Month (1-12)", min_value=1, max_value=12, value=1)
+        year = st.number_input("Enter Year", min_value=2025, max_value=2030, value=2025)
+        predict_button = st.form_submit_button(label="Predict")
+
+    selected_product = product
+    selected_month = month
+
+    if predict_button:
+        model_path = modelregistry.sales_model_path(selected_product)
+        try:
+            # Precomputed at training time; live prediction only outside the table
+            prediction = lookup(get_forecast_table(FORECAST_TABLE_PATH), selected_product, year, month)
+            if prediction is None:
+                model = modelregistry.get_model(model_path)
+                prediction = forecast_grid({selected_product: model}, [year], [month]).iloc[0, 0]
+            prediction_html = f"""
                 <div class='stock-container'>
                     <div class='stock-card'>
-                        <h3>Current Stock Levels</h3>
-                        <ul class='stock-list'>
-                            <li>Laptops: {laptops_stock}</li>
-                            <li>Tablets: {tablets_stock}</li>
-                            <li>Mobiles: {mobiles_stock}</li>
-                            <li>Smartwatches: {smartwatches_stock}</li>
-                            <li>Headphones: {headphones_stock}</li>
-                        </ul>
+                        <h3>Prediction Result</h3>
+                        <p>Predicted sales for {selected_product} in {selected_month}/{year}: {int(prediction)} units</p>
                     </div>
                 </div>
-            </div>
-        """
-        st.markdown(html_content, unsafe_allow_html=True)
-
-        with st.form(key="add_stock_form"):
-            item = st.selectbox("Select Item", ["Laptops", "Tablets", "Mobiles", "Smartwatches", "Headphones"])
-            quantity = st.number_input("Enter Quantity to Add", min_value=1, step=1, value=1)
-            submit_button = st.form_submit_button(label="Add Stock")
-
-        if submit_button:
-            stock_index = stock[stock['item'] == item].index
-            if not stock_index.empty:
-                stock.loc[stock_index, 'stock'] += quantity
-                stock.to_csv('datasets/item_stock_dataset.csv', index=False)
-                globals()[f"{item.lower()}_stock"] = stock.loc[stock['item'] == item, 'stock'].values[0]
-                st.success(f"✅ Successfully added {quantity} units to {item} stock.")
-            else:
-                st.error("Item not found in stock dataset.")
-            st.rerun()
-
-    elif st.session_state.dashboard_page == "future_trends":
-        html_content = f"""
-            <div class='main-content'>
-                <h2>🛍️ Future Trends</h2>
+            """
+            st.markdown(prediction_html, unsafe_allow_html=True)
+        except Exception as e:
+            print("Error type:", type(e).__name__)
+            print("Error message:", e)
+            tb = sys.exc_info()[2]
+            print("Line number:", tb.tb_lineno)
+            print("Full traceback:")
+            traceback.print_exc()
+            prediction_html = f"""
                 <div class='stock-container'>
                     <div class='stock-card'>
-                        <h3>Future Sales Prediction</h3>
+                        <h3>Prediction Result</h3>
+                        <p>Unable to predict due to an error: {str(e)}</p>
                     </div>
                 </div>
-            </div>
-        """
-        st.markdown(html_content, unsafe_allow_html=True)
-
-        with st.form(key="future_trends_form"):
-            product = st.selectbox("Select Product", ["Headphones", "Laptops", "Smartphones", "Smartwatches", "Tablets"])
-            month = st.number_input("Enter Month (1-12)", min_value=1, max_value=12, value=1)
-            year = st.number_input("Enter Year", min_value=2025, max_value=2030, value=2025)
-            predict_button = st.form_submit_button(label="Predict")
-
-        selected_product = product
-        selected_month = month
-
-        if predict_button:
-            model_path = f"models/sales/{selected_product.lower()}_model.joblib"
-            try:
-                model = joblib.load(model_path)
-                # Prepare input data with all expected features (value, Year, Month)
-                # input_data = pd.DataFrame([[0, year, month]], columns=["value", "Year", "Month"])
-                input_data = pd.DataFrame({'Year': [year], 'Month': [month]})
-                prediction = model.predict(input_data)[0]
-                prediction_html = f"""
-                    <div class='stock-container'>
-                        <div class='stock-card'>
-                            <h3>Prediction Result</h3>
-                            <p>Predicted sales for {selected_product} in {selected_month}/{year}: {int(prediction)} units</p>
-                        </div>
-                    </div>
-                """
-                st.markdown(prediction_html, unsafe_allow_html=True)
-            except Exception as e:
-                print("Error type:", type(e).__name__)
-                print("Error message:", e)
-                tb = sys.exc_info()[2]
-                print("Line number:", tb.tb_lineno)
-                print("Full traceback:")
-                traceback.print_exc()
-                prediction_html = f"""
-                    <div class='stock-container'>
-                        <div class='stock-card'>
-                            <h3>Prediction Result</h3>
-                            <p>Unable to predict due to an error: {str(e)}</p>
-                        </div>
-                    </div>
-                """
-                st.markdown(prediction_html, unsafe_allow_html=True)
-
-
-
+            """
+            st.markdown(prediction_html, unsafe_allow_html=True)
+
+    # Whole 2025-2030 horizon for every product
+    try:
+        forecast_table = get_forecast_table(FORECAST_TABLE_PATH)
+        if forecast_table is None:
+            sales_models = {
+                name: modelregistry.get_model(modelregistry.sales_model_path(name))
+                for name in ["Headphones", "Laptops", "Smartphones", "Smartwatches", "Tablets"]
+            }
+            forecast_table = forecast_grid(sales_models, FORECAST_YEARS)
+        st.markdown("<h3 style='color:white;'>Forecast 2025-2030 (units per month)</h3>", unsafe_allow_html=True)
+        st.line_chart(forecast_table.T)
+        with st.expander("Forecast table"):
+            st.dataframe(forecast_table.T.astype(int))
+    except Exception as e:
+        st.error(f"Unable to build forecast: {str(e)}")
 
 
-    elif st.session_state.dashboard_page == "employees":
+# Employees Page
+def page_employees():
+    import pandas as pd
+    from AI.employeetraining import FEATURES, describe_errors, education_levels, predict_hire_batch
+    from services import employeestore, modelregistry
 
-        employees = st.session_state.employees.copy()
+    modelregistry.warm([modelregistry.HIRE_MODEL])
 
-        # Render the HTML content using st.markdown with unsafe_allow_html=True
+    # Render the HTML content using st.markdown with unsafe_allow_html=True
 
-        html_content = """
+    html_content = """
 
-            <style>
+        <style>
 
-                .main-content {
+            .main-content {
 
-                    background-color: #1e1e1e;
+                background-color: #1e1e1e;
 
-                    padding: 20px;
+                padding: 20px;
 
-                    border-radius: 10px;
+                border-radius: 10px;
 
-                    color: white;
+                color: white;
 
-                }
+            }
 
-                .stock-container {
+            .stock-container {
 
-                    display: flex;
+                display: flex;
 
-                    gap: 20px;
+                gap: 20px;
 
-                    margin-top: 10px;
+                margin-top: 10px;
 
-                }
+            }
 
-                .stock-card {
+            .stock-card {
 
-                    background-color: #333;
+                background-color: #333;
 
-                    padding: 15px;
+                padding: 15px;
 
-                    border-radius: 10px;
+                border-radius: 10px;
 
-                    width: 100%;
+                width: 100%;
 
-                    box-shadow: 0 4px 6px rgba(0,0,0,0.3);
+                box-shadow: 0 4px 6px rgba(0,0,0,0.3);
 
-                }
+            }
 
-            </style>
+        </style>
 
-        """
+    """
 
-        st.markdown(html_content, unsafe_allow_html=True)
+    st.markdown(html_content, unsafe_allow_html=True)
 
-        # Display employee table
+    # Display employee table: one page at a time, sorted and filtered by the store
 
-        employees_with_index = employees.reset_index(drop=True)
+    st.markdown("<h3 style='color:white;'>Employee List</h3>", unsafe_allow_html=True)
 
-        employees_with_index.index = employees_with_index.index + 1
+    filter_col, education_col, sort_col, order_col = st.columns([3, 2, 2, 1])
+    search = filter_col.text_input("Search name or email", key="employee_search")
+    education_filter = education_col.selectbox("Education", [""] + employeestore.education_levels(),
+                                               key="employee_education")
+    sort = sort_col.selectbox("Sort by", employeestore.SORT_COLUMNS, key="employee_sort")
+    descending = order_col.checkbox("Desc", key="employee_desc")
 
-        st.markdown("<h3 style='color:white;'>Employee List</h3>", unsafe_allow_html=True)
+    page_size = 50
+    total = employeestore.count(search, education_filter)
+    page_count = max(1, -(-total // page_size))
+    page_number = st.number_input(f"Page (of {page_count})", min_value=1, max_value=page_count, value=1, step=1,
+                                  key="employee_page")
+    employees, total = employeestore.page((page_number - 1) * page_size, page_size, sort, descending,
+                                          search, education_filter, total=total)
+    employees.index = employees.index + 1 + (page_number - 1) * page_size
+    st.caption(f"{total:,} matching employees")
+    st.dataframe(employees)
 
-        st.table(employees_with_index)
+    # Form to remove an employee (by EmailID, from the page shown above)
 
-        # Form to remove an employee
+    with st.form(key="remove_employee_form"):
 
-        with st.form(key="remove_employee_form"):
+        remove_email = st.selectbox(
+            "Select Employee to Remove", [''] + employees['EmailID'].tolist(), index=0,
+            format_func=lambda email: "" if not email else
+            f"{employees.loc[employees['EmailID'] == email, 'Name'].iloc[0]} <{email}>")
 
-            remove_name = st.selectbox("Select Employee to Remove", [''] + employees['Name'].tolist(), index=0)
+        remove_button = st.form_submit_button(label="Remove Employee")
 
-            remove_button = st.form_submit_button(label="Remove Employee")
+    if remove_button and remove_email:
+        if employeestore.remove(remove_email):
+            st.success(f"✅ Removed {remove_email} from employees.")
+        st.rerun()
 
-        if remove_button and remove_name:
-            employees = employees[employees['Name'] != remove_name]
+    # Form to add a new employee
 
-            employees.to_csv('datasets/employee_dataset.csv', index=False)
+    with st.form(key="add_employee_form"):
 
-            st.session_state.employees = employees
+        name = st.text_input("Name")
 
-            st.success(f"✅ Removed {remove_name} from employees.")
+        email = st.text_input("Email ID")
 
-            st.rerun()
+        years_exp = st.number_input("Years of Experience", min_value=0, step=1, value=0)
 
-        # Form to add a new employee
+        education = st.selectbox("Education Level", education_levels)
 
-        with st.form(key="add_employee_form"):
+        skill_score = st.number_input("Skill Score (0-100)", min_value=0, max_value=100, step=1, value=50)
 
-            name = st.text_input("Name")
+        certifications = st.text_input("Certifications (comma-separated)", value="0")
 
-            email = st.text_input("Email ID")
+        add_button = st.form_submit_button(label="Add Candidate")
 
-            years_exp = st.number_input("Years of Experience", min_value=0, step=1, value=0)
+    if add_button and name and email:
 
-            education = st.selectbox("Education Level", ["High School", "Bachelor's", "Master's", "PhD"])
+        certs = certifications.split(",")[0].strip() if certifications else "0"
 
-            skill_score = st.number_input("Skill Score (0-100)", min_value=0, max_value=100, step=1, value=50)
+        try:
 
-            certifications = st.text_input("Certifications (comma-separated)", value="0")
+            certs_numeric = int(certs)
 
-            add_button = st.form_submit_button(label="Add Candidate")
+        except ValueError:
 
-        if add_button and name and email:
+            certs_numeric = 0
 
-            certs = certifications.split(",")[0].strip() if certifications else "0"
+        input_data = pd.DataFrame(
 
-            try:
+            [[years_exp, education, skill_score, certs_numeric]],
 
-                certs_numeric = int(certs)
+            columns=["YearsExperience", "EducationLevel", "SkillScore", "Certifications"]
 
-            except ValueError:
+        )
 
-                certs_numeric = 0
+        try:
 
-            input_data = pd.DataFrame(
+            model = modelregistry.get_predictor(modelregistry.HIRE_MODEL)
 
-                [[years_exp, education, skill_score, certs_numeric]],
+            # The model is a classifier: show the class and its probability
+            proba = model.predict_proba(input_data)[0]
 
-                columns=["YearsExperience", "EducationLevel", "SkillScore", "Certifications"]
+            hire_probability = proba[list(model.classes_).index(1)]
 
-            )
+            should_hire = model.classes_[proba.argmax()] == 1
 
-            try:
+            st.write(f"Prediction: {'Hire' if should_hire else 'Not Hire'} "
+                     f"(hire probability {hire_probability:.0%})")
 
-                model = joblib.load("models/employeehire/hire_model.joblib")
+            # Store candidate details in session state to use after decision
 
-                prediction = model.predict(input_data)[0]
+            st.session_state.candidate = {
 
-                st.write(f"Predicted Hire Score: {prediction:.2f}")
+                "name": name,
 
-                # Store candidate details in session state to use after decision
+                "email": email,
 
-                st.session_state.candidate = {
+                "years_exp": years_exp,
 
-                    "name": name,
+                "education": education,
 
-                    "email": email,
+                "skill_score": skill_score,
 
-                    "years_exp": years_exp,
+                "certs_numeric": certs_numeric
 
-                    "education": education,
-
-                    "skill_score": skill_score,
-
-                    "certs_numeric": certs_numeric
-
-                }
+            }
 
 
-            except Exception as e:
+        except Exception as e:
 
-                st.error(f"Error loading model or predicting: {str(e)}")
+            st.error(f"Error loading model or predicting: {str(e)}")
 
-        # Handle candidate decision outside the form
+    # Handle candidate decision outside the form
 
-        if "candidate" in st.session_state:
+    if "candidate" in st.session_state:
 
-            st.markdown("### Candidate Decision")
+        st.markdown("### Candidate Decision")
 
-            col1, col2 = st.columns(2)
+        col1, col2 = st.columns(2)
 
-            with col1:
+        with col1:
 
-                if st.button("Accept Candidate"):
-                    candidate = st.session_state.candidate
+            if st.button("Accept Candidate"):
+                candidate = st.session_state.candidate
 
-                    new_employee = pd.DataFrame({
+                try:
+                    employeestore.add({
 
-                        "Name": [candidate["name"]],
+                        "Name": candidate["name"],
 
-                        "EmailID": [candidate["email"]],
+                        "EmailID": candidate["email"],
 
-                        "YearsExperience": [candidate["years_exp"]],
+                        "YearsExperience": candidate["years_exp"],
 
-                        "EducationLevel": [candidate["education"]],
+                        "EducationLevel": candidate["education"],
 
-                        "SkillScore": [candidate["skill_score"]],
+                        "SkillScore": candidate["skill_score"],
 
-                        "Certifications": [candidate["certs_numeric"]]
+                        "Certifications": candidate["certs_numeric"]
 
                     })
+                except employeestore.EmployeeError as e:
+                    st.error(str(e))
+                else:
+                    st.success(f"✅ Added {candidate['name']} to employees.")
 
-                    employees = pd.concat([employees, new_employee], ignore_index=True)
+                    del st.session_state.candidate  # Clear candidate data
 
-                    employees.to_csv('datasets/employee_dataset.csv', index=False)
+                    st.rerun()
 
-                    st.session_state.employees = employees
+        with col2:
 
-                    st.success(f"✅ Added {candidate['name']} to employees.")
+            if st.button("Reject Candidate"):
+                st.info("Candidate rejected.")
 
-                    del st.session_state.candidate  # Clear candidate data
+                del st.session_state.candidate  # Clear candidate data
 
-                    st.rerun()
+    # Bulk screening: a CSV of candidates in the employee_cv.csv schema, scored
+    # in one predict_proba pass with the cached model
 
-            with col2:
+    st.markdown("### Bulk Candidate Screening")
 
-                if st.button("Reject Candidate"):
-                    st.info("Candidate rejected.")
+    uploaded = st.file_uploader("Upload candidates CSV (YearsExperience, EducationLevel, SkillScore, "
+                                "Certifications; CandidateID optional)", type="csv", key="screening_upload")
 
-                    del st.session_state.candidate  # Clear candidate data
+    if uploaded is not None:
+        screening = st.session_state.get("screening")
+        if screening is None or screening["file_id"] != uploaded.file_id:
+            candidates = pd.read_csv(uploaded)
+            missing = [column for column in FEATURES if column not in candidates.columns]
+            if missing:
+                st.error(f"Missing column(s): {', '.join(missing)}")
+                return
+            if "CandidateID" not in candidates.columns:
+                candidates.insert(0, "CandidateID", range(1, len(candidates) + 1))
+            try:
+                # The sklearn pipeline itself: for thousands of rows its tree
+                # traversal beats the compiled single-row form
+                model = modelregistry.get_model(modelregistry.HIRE_MODEL)
+                scores = predict_hire_batch(candidates["YearsExperience"], candidates["EducationLevel"],
+                                            candidates["SkillScore"], candidates["Certifications"], model=model)
+            except Exception as e:
+                st.error(f"Error loading model or predicting: {str(e)}")
+                return
+            results = candidates[["CandidateID"] + FEATURES].assign(
+                Prediction=pd.Series(scores["should_hire"]).map({True: "Hire", False: "Not Hire"}).to_numpy(),
+                HireProbability=scores["hire_probability"].round(4),
+            )
+            valid = scores["error"] == 0
+            ranked = results[valid].sort_values("HireProbability", ascending=False, kind="stable")
+            ranked.insert(0, "Rank", range(1, len(ranked) + 1))
+            rejected = results[~valid].drop(columns=["Prediction", "HireProbability"]).assign(
+                Error=[describe_errors(error) for error in scores["error"][~valid]])
+            screening = st.session_state.screening = {"file_id": uploaded.file_id, "ranked": ranked,
+                                                      "rejected": rejected}
+
+        ranked = screening["ranked"]
+        hires_only = st.checkbox("Only candidates predicted to hire", value=True, key="screening_hires_only")
+        shortlist = ranked[ranked["Prediction"] == "Hire"] if hires_only else ranked
+        st.caption(f"{len(ranked):,} candidates scored, {int((ranked['Prediction'] == 'Hire').sum()):,} "
+                   f"predicted to hire; showing {len(shortlist):,}")
+        st.dataframe(shortlist, hide_index=True)
+        st.download_button("Download shortlist", shortlist.to_csv(index=False).encode("utf-8"),
+                           file_name="candidate_shortlist.csv", mime="text/csv")
+        if len(screening["rejected"]):
+            with st.expander(f"{len(screening['rejected']):,} rows could not be scored"):
+                st.dataframe(screening["rejected"], hide_index=True)
+
+
+# Generate Bill Page
+def page_generate_bill():
+    from datetime import datetime, timedelta
+
+    import pandas as pd
+    from services import billarchive, billing, stockledger
+    from services.catalog import PRODUCTS
+
+    html_content = f"""
+        <div class='main-content'>
+            <h2>🧾 Generate Bill</h2>
+            <div class='stock-container'>
+                <div class='stock-card'>
+                    <h3>Generate Bill</h3>
+                </div>
+            </div>
+        </div>
+    """
+    st.markdown(html_content, unsafe_allow_html=True)
+
+    if "cart" not in st.session_state:
+        st.session_state.cart = []
+
+    with st.form(key="add_to_bill_form"):
+        product = st.selectbox("Select Product", PRODUCTS)
+        quantity = st.number_input("Quantity", min_value=1, step=1, value=1)
+        add_button = st.form_submit_button(label="Add to Bill")
+
+    if add_button:
+        st.session_state.cart.append((product, int(quantity)))
+
+    if st.session_state.cart:
+        cart_bill = billing.make_bill("", st.session_state.cart)
+        cart_lines = pd.DataFrame(cart_bill["lines"])
+        cart_lines.columns = ["Product", "Quantity", "Price per Unit (₹)", "Amount (₹)"]
+        st.table(cart_lines)
+        st.write(f"Total: ₹{cart_bill['total']:,}")
+        if st.button("Clear Items"):
+            st.session_state.cart = []
+            st.rerun()
 
-    elif st.session_state.dashboard_page == "generate_bill":
-        html_content = f"""
-            <div class='main-content'>
-                <h2>🧾 Generate Bill</h2>
-                <div class='stock-container'>
-                    <div class='stock-card'>
-                        <h3>Generate Bill</h3>
-                    </div>
+    with st.form(key="generate_bill_form"):
+        customer_name = st.text_input("Customer Name")
+        generate_button = st.form_submit_button(label="Generate Bill")
+
+    if generate_button:
+        if not st.session_state.cart:
+            st.error("Add at least one product to the bill.")
+            return
+        bill = billing.make_bill(customer_name, st.session_state.cart)
+
+        quantities = billing.stock_quantities(bill)
+        try:
+            # Reserve and decrement stock for every line in one transaction; oversells are rejected
+            stockledger.remove_many(quantities, reason=f"bill: {customer_name}")
+        except stockledger.StockError as e:
+            st.error(f"Cannot generate bill: {str(e)}")
+            return
+
+        try:
+            bill_no, pdf_bytes = billarchive.record(bill)
+        except Exception as e:
+            # Nothing was archived; release the reserved stock
+            stockledger.add_many(quantities, reason=f"bill failed: {customer_name}")
+            st.error(f"Cannot generate bill: {str(e)}")
+            return
+        st.session_state.last_bill = {"bill_no": bill_no, "bill": bill, "pdf": pdf_bytes}
+        st.session_state.cart = []
+        st.rerun()
+
+    if "last_bill" in st.session_state:
+        bill = st.session_state.last_bill["bill"]
+        line_items = "".join(
+            f"<li>{line['product']}: {line['quantity']} x ₹{line['unit_price']:,} = ₹{line['amount']:,}</li>"
+            for line in bill["lines"]
+        )
+        bill_html = f"""
+            <div class='stock-container'>
+                <div class='stock-card'>
+                    <h3>Bill No. {st.session_state.last_bill['bill_no']} for {bill['customer']}</h3>
+                    <ul class='stock-list'>
+                        {line_items}
+                        <li>Total Cost: ₹{bill['total']:,}</li>
+                    </ul>
                 </div>
             </div>
         """
-        st.markdown(html_content, unsafe_allow_html=True)
-
-        with st.form(key="generate_bill_form"):
-            customer_name = st.text_input("Customer Name")
-            product = st.selectbox("Select Product", ["Smartphones", "Laptops", "Tablets", "Headphones", "Smartwatches"])
-            quantity = st.number_input("Quantity", min_value=1, step=1, value=1)
-            generate_button = st.form_submit_button(label="Generate Bill")
-
-        if generate_button:
-            price_per_unit = {
-                "Smartphones": smartphone_cost,
-                "Laptops": laptop_cost,
-                "Tablets": tablet_cost,
-                "Headphones": headphones_cost,
-                "Smartwatches": smartwatch_cost
-            }.get(product, 0)
-            total_cost = price_per_unit * quantity
-
-            bill_html = f"""
-                <div class='stock-container'>
-                    <div class='stock-card'>
-                        <h3>Bill for {customer_name}</h3>
-                        <ul class='stock-list'>
-                            <li>Product: {product}</li>
-                            <li>Quantity: {quantity}</li>
-                            <li>Price per Unit: ₹{price_per_unit:,}</li>
-                            <li>Total Cost: ₹{total_cost:,}</li>
-                        </ul>
-                    </div>
-                </div>
-            """
-            st.markdown(bill_html, unsafe_allow_html=True)
-
-            pdf_bytes = generate_bill_pdf(customer_name, product, quantity, price_per_unit, total_cost)
-            st.download_button(
-                label="Download Bill",
-                data=pdf_bytes,
-                file_name="bill.pdf",
-                mime="application/pdf"
+        st.markdown(bill_html, unsafe_allow_html=True)
+
+        st.download_button(
+            label="Download Bill",
+            data=st.session_state.last_bill["pdf"],
+            file_name=f"bill_{st.session_state.last_bill['bill_no']}.pdf",
+            mime="application/pdf"
+        )
+
+    # Bill archive: reprints come from the stored PDFs
+    with st.expander("🔎 Bill Archive"):
+        with st.form(key="bill_search_form"):
+            search_bill_no = st.number_input("Bill No. (0 for any)", min_value=0, step=1, value=0)
+            search_customer = st.text_input("Customer Name")
+            search_dates = st.date_input("Date Range", value=())
+            search_button = st.form_submit_button(label="Search Bills")
+
+        if search_button:
+            start = end = None
+            if len(search_dates) == 2:
+                start = datetime.combine(search_dates[0], datetime.min.time())
+                end = datetime.combine(search_dates[1], datetime.min.time()) + timedelta(days=1)
+            st.session_state.bill_search = billarchive.search(
+                bill_no=search_bill_no or None, customer=search_customer or None, start=start, end=end
             )
 
-    elif st.session_state.dashboard_page == "vip_customers":
-        st.markdown(
-            f"""
-            <div class='main-content'>
-                <h2>💎 VIP Customers</h2>
-                <div class='stock-container'>
-                    <div class='stock-card'>
-                        <h3>Check VIP Status</h3>
-                    </div>
+        results = st.session_state.get("bill_search")
+        if results is not None:
+            if results.empty:
+                st.info("No bills found.")
+            else:
+                st.dataframe(results, hide_index=True)
+                reprint_no = st.selectbox("Reprint Bill", results["bill_no"].tolist())
+                archived_pdf = billarchive.get_pdf(reprint_no)
+                if archived_pdf is not None:
+                    st.download_button(
+                        label="Download Archived Bill",
+                        data=archived_pdf,
+                        file_name=f"bill_{reprint_no}.pdf",
+                        mime="application/pdf"
+                    )
+
+
+# Vip Customers Page
+def page_vip_customers():
+    import pandas as pd
+    from services import modelregistry, viplog
+    from services.catalog import PRODUCTS
+
+    modelregistry.warm([modelregistry.VIP_MODEL])
+
+    st.markdown(
+        f"""
+        <div class='main-content'>
+            <h2>💎 VIP Customers</h2>
+            <div class='stock-container'>
+                <div class='stock-card'>
+                    <h3>Check VIP Status</h3>
                 </div>
             </div>
-            """,
-            unsafe_allow_html=True
-        )
+        </div>
+        """,
+        unsafe_allow_html=True
+    )
 
-        with st.form(key="vip_customer_form"):
-            total_spend = st.number_input("Total Spend (₹)", min_value=0.0, step=100.0)
-            purchase_frequency = st.number_input("Purchase Frequency (per month)", min_value=0.0, step=0.1)
-            preferred_product = st.selectbox("Preferred Product", ["Smartphones", "Laptops", "Tablets", "Headphones", "Smartwatches"])
-            submit_button = st.form_submit_button(label="Check VIP Status")
-
-        if submit_button:
-            # Map preferred product to numerical value
-            product_mapping = {
-                "Smartphones": 0,
-                "Laptops": 1,
-                "Tablets": 2,
-                "Headphones": 3,
-                "Smartwatches": 4
-            }
-            preferred_product_encoded = product_mapping.get(preferred_product, -1)
+    with st.form(key="vip_customer_form"):
+        total_spend = st.number_input("Total Spend (₹)", min_value=0.0, step=100.0)
+        purchase_frequency = st.number_input("Purchase Frequency (per month)", min_value=0.0, step=0.1)
+        preferred_product = st.selectbox("Preferred Product", PRODUCTS)
+        submit_button = st.form_submit_button(label="Check VIP Status")
+
+    if submit_button:
+        # Map preferred product to numerical value
+        product_mapping = {
+            "Smartphones": 0,
+            "Laptops": 1,
+            "Tablets": 2,
+            "Headphones": 3,
+            "Smartwatches": 4
+        }
+        preferred_product_encoded = product_mapping.get(preferred_product, -1)
 
-            if preferred_product_encoded == -1:
-                st.error("Invalid preferred product selected.")
-            else:
-                # Prepare input data for the model
-                # input_data = pd.DataFrame(
-                #     [[total_spend, purchase_frequency, preferred_product_encoded]],
-                #     columns=["TotalSpend", "PurchaseFrequency", "PreferredProduct"]
-                # )
-                input_data = pd.DataFrame({
-                    'TotalSpend': [total_spend],
-                    'PurchaseFrequency': [purchase_frequency],
-                    'PreferredProduct': [preferred_product]
-                })
+        if preferred_product_encoded == -1:
+            st.error("Invalid preferred product selected.")
+        else:
+            # Prepare input data for the model
+            # input_data = pd.DataFrame(
+            #     [[total_spend, purchase_frequency, preferred_product_encoded]],
+            #     columns=["TotalSpend", "PurchaseFrequency", "PreferredProduct"]
+            # )
+            input_data = pd.DataFrame({
+                'TotalSpend': [total_spend],
+                'PurchaseFrequency': [purchase_frequency],
+                'PreferredProduct': [preferred_product]
+            })
 
-                try:
-                    model = joblib.load("models/customervipcheck/vip_model.joblib")
-                    prediction = model.predict(input_data)[0]
-
-                    # Load existing customer data
-                    customer_data = pd.read_csv('datasets/customer_behavior_vip.csv')
-
-                    # Get the last index and CustomerID
-                    last_index = customer_data.index[-1]  # Use the last index of the DataFrame
-                    last_customer_id = customer_data.iloc[-1]["CustomerID"]
-
-                    # Prepare input_data
-                    input_data["IsVIP"] = prediction
-                    input_data["CustomerID"] = last_customer_id + 1
-                    input_data.index = [last_index + 1]  # Set the index for input_data
-
-                    # Concatenate the data
-                    customer_data = pd.concat([customer_data, input_data])
-
-                    # Save to CSV without the index column
-                    customer_data.to_csv('datasets/customer_behavior_vip.csv', index=False)
-
-                    if prediction == 1:
-                        st.success("This customer should be made a VIP!")
-                    else:
-                        st.info("This customer does not qualify as a VIP.")
-                except Exception as e:
-                    st.error(f"Error in prediction: {str(e)}")
-                    print("Error type:", type(e).__name__)
-                    print("Error message:", e)
-                    tb = sys.exc_info()[2]
-                    print("Line number:", tb.tb_lineno)
-                    print("Full traceback:")
-                    traceback.print_exc()
-
-    elif st.session_state.dashboard_page == "settings":
-        html_content = f"""
-            <div class='main-content'>
-                <h2>⚙️ Settings</h2>
-                <div class='stock-container'>
-                    <div class='stock-card'>
-                        <h3>Settings</h3>
-                        <p>Settings content here.</p>
-                    </div>
+            try:
+                model = modelregistry.get_predictor(modelregistry.VIP_MODEL)
+                prediction = model.predict(input_data)[0]
+
+                # Record the check; appends one line instead of rewriting the dataset
+                viplog.append(total_spend, purchase_frequency, preferred_product, prediction)
+
+                if prediction == 1:
+                    st.success("This customer should be made a VIP!")
+                else:
+                    st.info("This customer does not qualify as a VIP.")
+            except Exception as e:
+                st.error(f"Error in prediction: {str(e)}")
+                print("Error type:", type(e).__name__)
+                print("Error message:", e)
+                tb = sys.exc_info()[2]
+                print("Line number:", tb.tb_lineno)
+                print("Full traceback:")
+                traceback.print_exc()
+
+
+# Settings Page
+def page_settings():
+    html_content = f"""
+        <div class='main-content'>
+            <h2>⚙️ Settings</h2>
+            <div class='stock-container'>
+                <div class='stock-card'>
+                    <h3>Settings</h3>
+                    <p>Settings content here.</p>
                 </div>
             </div>
-        """
-        st.markdown(html_content, unsafe_allow_html=True)
+        </div>
+    """
+    st.markdown(html_content, unsafe_allow_html=True)
+
 
 # Registration Page
 def register_page():
+    from services import userstore
+
     st.title("🔐 Register")
     name = st.text_input("Name")
     email = st.text_input("Email")
     password = st.text_input("Password", type="password")
     if st.button("Register"):
-        if users_collection.find_one({"email": email}):
-            st.warning("Email already registered.")
-        else:
-            users_collection.insert_one({"name": name, "email": email, "password": password})
+        if userstore.register(name, email, password):
             st.success("Registration successful! Please login.")
             st.session_state.page = "login"
+        else:
+            st.warning("Email already registered.")
     if st.button("Back to Login"):
         st.session_state.page = "login"
 
 # Login Page
 def login_page():
+    from services import userstore
+
     st.title("🔐 Login")
     email = st.text_input("Email")
     password = st.text_input("Password", type="password")
     if st.button("Login"):
-        user = users_collection.find_one({"email": email, "password": password})
+        user = userstore.authenticate(email, password)
         if user:
             st.session_state.logged_in = True
             st.session_state.user = user
@@ -730,10 +884,22 @@ def login_page():
     if st.button("Go to Register"):
         st.session_state.page = "register"
 
+PAGES = {
+    "overview": page_overview,
+    "stock": page_stock,
+    "future_trends": page_future_trends,
+    "employees": page_employees,
+    "generate_bill": page_generate_bill,
+    "vip_customers": page_vip_customers,
+    "settings": page_settings,
+    "login": login_page,
+    "register": register_page,
+}
+
 # Page Routing
 if st.session_state.logged_in:
     show_home()
 elif st.session_state.page == "register":
-    register_page()
+    render_page("register")
 else:
-    login_page()
\ No newline at end of file
+    render_page("login")
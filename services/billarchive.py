@@ -0,0 +1,145 @@
+import hashlib
+import os
+import time
+from datetime import datetime
+
+import pandas as pd
+
+from services import salesfacts, sqlitedb
+from services.billing import render_bill
+
+# Every generated bill gets a sequential number and is stored with its line
+# items; the PDF goes to a content-addressed archive (bill_archive/ab/abcd...pdf)
+# so reprints and audits never need to regenerate it.
+DB_PATH = salesfacts.DB_PATH
+ARCHIVE_DIR = os.environ.get("BILL_ARCHIVE_DIR", "datasets/bill_archive")
+
+
+def _init(conn):
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS bills ("
+        " bill_no INTEGER PRIMARY KEY AUTOINCREMENT,"
+        " customer TEXT NOT NULL,"
+        " customer_key TEXT NOT NULL,"
+        " created_at REAL NOT NULL,"
+        " total INTEGER NOT NULL,"
+        " pdf_sha256 TEXT)"
+    )
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS bill_lines ("
+        " bill_no INTEGER NOT NULL REFERENCES bills (bill_no),"
+        " line_no INTEGER NOT NULL,"
+        " product TEXT NOT NULL,"
+        " quantity INTEGER NOT NULL,"
+        " unit_price INTEGER NOT NULL,"
+        " amount INTEGER NOT NULL,"
+        " PRIMARY KEY (bill_no, line_no)) WITHOUT ROWID"
+    )
+    # Customer lookups (optionally within a date range) and pure date-range scans
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_bills_customer ON bills (customer_key, created_at)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_bills_created ON bills (created_at)")
+    # The first time, also backfills facts for bills archived before the fact table existed
+    salesfacts.create_tables(conn)
+
+
+def _conn():
+    return sqlitedb.connection(DB_PATH, _init)
+
+
+def _customer_key(customer):
+    return " ".join(customer.lower().split())
+
+
+def _format_time(timestamp):
+    return datetime.fromtimestamp(timestamp).strftime("%Y-%m-%d %H:%M")
+
+
+def pdf_path(sha256):
+    return os.path.join(ARCHIVE_DIR, sha256[:2], f"{sha256}.pdf")
+
+
+def _store_pdf(pdf_bytes):
+    sha256 = hashlib.sha256(pdf_bytes).hexdigest()
+    path = pdf_path(sha256)
+    if not os.path.exists(path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(pdf_bytes)
+        os.replace(tmp_path, path)
+    return sha256
+
+
+def _insert_bill(conn, bill, created_at):
+    bill_no = conn.execute(
+        "INSERT INTO bills (customer, customer_key, created_at, total) VALUES (?, ?, ?, ?)",
+        (bill["customer"], _customer_key(bill["customer"]), created_at, bill["total"]),
+    ).lastrowid
+    conn.executemany(
+        "INSERT INTO bill_lines (bill_no, line_no, product, quantity, unit_price, amount) VALUES (?, ?, ?, ?, ?, ?)",
+        [(bill_no, line_no, line["product"], line["quantity"], line["unit_price"], line["amount"])
+         for line_no, line in enumerate(bill["lines"], start=1)],
+    )
+    return bill_no
+
+
+def record(bill):
+    # Allocates the bill number, stores the lines, renders and archives the PDF.
+    # All in one write transaction: if rendering or storing fails, neither the
+    # bill nor its sales facts are kept. Returns (bill_no, pdf_bytes).
+    created_at = time.time()
+    with sqlitedb.transaction(_conn()) as conn:
+        bill_no = _insert_bill(conn, bill, created_at)
+        salesfacts.append(conn, bill_no, bill, created_at)
+        pdf_bytes = render_bill(dict(bill, created_at=_format_time(created_at)), bill_no)
+        sha256 = _store_pdf(pdf_bytes)
+        conn.execute("UPDATE bills SET pdf_sha256 = ? WHERE bill_no = ?", (sha256, bill_no))
+    return bill_no, pdf_bytes
+
+
+def _bills_frame(rows):
+    bills = pd.DataFrame(rows, columns=["bill_no", "customer", "created_at", "total"])
+    # Local time, like the printed bill (_format_time) and the search() filters
+    bills["created_at"] = pd.to_datetime([datetime.fromtimestamp(t) for t in bills["created_at"]])
+    return bills
+
+
+def search(bill_no=None, customer=None, start=None, end=None, limit=100):
+    # start/end are datetimes (end exclusive). Each filter combination is served
+    # by the primary key or one of the indexes above; newest bills first.
+    clauses, params = [], []
+    if bill_no is not None:
+        clauses.append("bill_no = ?")
+        params.append(int(bill_no))
+    if customer:
+        clauses.append("customer_key = ?")
+        params.append(_customer_key(customer))
+    if start is not None:
+        clauses.append("created_at >= ?")
+        params.append(start.timestamp())
+    if end is not None:
+        clauses.append("created_at < ?")
+        params.append(end.timestamp())
+    where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+    rows = _conn().execute(
+        f"SELECT bill_no, customer, created_at, total FROM bills {where}"
+        f" ORDER BY created_at DESC LIMIT ?", (*params, limit),
+    ).fetchall()
+    return _bills_frame(rows)
+
+
+def get_lines(bill_no):
+    rows = _conn().execute(
+        "SELECT product, quantity, unit_price, amount FROM bill_lines WHERE bill_no = ? ORDER BY line_no",
+        (int(bill_no),),
+    ).fetchall()
+    return pd.DataFrame(rows, columns=["product", "quantity", "unit_price", "amount"])
+
+
+def get_pdf(bill_no):
+    # Archived PDF bytes, or None for an unknown bill
+    row = _conn().execute("SELECT pdf_sha256 FROM bills WHERE bill_no = ?", (int(bill_no),)).fetchone()
+    if row is None or row[0] is None:
+        return None
+    with open(pdf_path(row[0]), "rb") as f:
+        return f.read()
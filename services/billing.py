@@ -0,0 +1,127 @@
+import argparse
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from fpdf import FPDF
+
+from services.catalog import PRODUCTS, stock_item, unit_price
+
+
+def make_bill(customer_name, cart):
+    # cart: iterable of (product, quantity); repeated products are merged
+    quantities = {}
+    for product, quantity in cart:
+        if product not in PRODUCTS:
+            raise ValueError(f"Unknown product: {product}")
+        if quantity <= 0:
+            raise ValueError(f"Quantity must be positive for {product}")
+        quantities[product] = quantities.get(product, 0) + int(quantity)
+    lines = [
+        {
+            "product": product,
+            "quantity": quantity,
+            "unit_price": unit_price(product),
+            "amount": unit_price(product) * quantity,
+        }
+        for product, quantity in quantities.items()
+    ]
+    return {
+        "customer": customer_name,
+        "lines": lines,
+        "total": sum(line["amount"] for line in lines),
+    }
+
+
+def stock_quantities(bill):
+    # Quantities to reserve per stock item, e.g. Smartphones -> Mobiles
+    quantities = {}
+    for line in bill["lines"]:
+        item = stock_item(line["product"])
+        quantities[item] = quantities.get(item, 0) + line["quantity"]
+    return quantities
+
+
+# Typographic characters people paste into names, mapped to latin-1 look-alikes
+_PDF_REPLACEMENTS = str.maketrans({
+    "\u2018": "'", "\u2019": "'", "\u201c": '"', "\u201d": '"',
+    "\u2013": "-", "\u2014": "-", "\u2026": "...", "\u20b9": "Rs.",
+})
+
+
+def pdf_text(text):
+    # FPDF's core fonts only cover latin-1; anything else becomes '?'
+    return str(text).translate(_PDF_REPLACEMENTS).encode("latin-1", "replace").decode("latin-1")
+
+
+def _new_pdf():
+    # Fresh document per bill so no FPDF state is shared between threads
+    pdf = FPDF()
+    pdf.add_page()
+    pdf.set_font("Arial", size=12)
+    pdf.cell(200, 10, txt="SYS MART", ln=1, align='C')
+    return pdf
+
+
+def render_bill(bill, bill_number=None):
+    pdf = _new_pdf()
+    if bill_number is not None:
+        pdf.cell(200, 10, txt=f"Bill No: {bill_number}", ln=1, align='L')
+    if bill.get("created_at"):
+        pdf.cell(200, 10, txt=f"Date: {bill['created_at']}", ln=1, align='L')
+    pdf.cell(200, 10, txt=f"Customer: {pdf_text(bill['customer'])}", ln=1, align='L')
+
+    pdf.cell(70, 8, txt="Product", border=1)
+    pdf.cell(25, 8, txt="Quantity", border=1, align='R')
+    pdf.cell(45, 8, txt="Price per Unit", border=1, align='R')
+    pdf.cell(45, 8, txt="Amount", border=1, align='R', ln=1)
+    for line in bill["lines"]:
+        pdf.cell(70, 8, txt=pdf_text(line["product"]), border=1)
+        pdf.cell(25, 8, txt=str(line["quantity"]), border=1, align='R')
+        pdf.cell(45, 8, txt=f"Rs. {line['unit_price']:,}", border=1, align='R')
+        pdf.cell(45, 8, txt=f"Rs. {line['amount']:,}", border=1, align='R', ln=1)
+
+    pdf.cell(200, 10, txt=f"Total Cost: Rs. {bill['total']:,}", ln=1, align='L')
+    return pdf.output(dest='S').encode('latin1')
+
+
+def _render_numbered(item):
+    bill_number, bill = item
+    return render_bill(bill, bill_number)
+
+
+def render_batch(bills, workers=0, chunksize=64):
+    # bills: list of (bill_number, bill); returns PDF bytes in the same order
+    if not workers:
+        return [_render_numbered(item) for item in bills]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(_render_numbered, bills, chunksize=chunksize))
+
+
+def _random_bills(count, seed=42):
+    rng = random.Random(seed)
+    bills = []
+    for number in range(1, count + 1):
+        cart = [(rng.choice(PRODUCTS), rng.randint(1, 5)) for _ in range(rng.randint(1, 6))]
+        bills.append((number, make_bill(f"Customer {number}", cart)))
+    return bills
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark batch bill rendering.")
+    parser.add_argument('--bills', type=int, default=5000)
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                        help="worker processes (0 renders in this process)")
+    args = parser.parse_args()
+
+    bills = _random_bills(args.bills)
+    start = time.perf_counter()
+    pdfs = render_batch(bills, args.workers)
+    elapsed = time.perf_counter() - start
+    print(f"Rendered {len(pdfs)} bills in {elapsed:.2f}s ({len(pdfs) / elapsed:,.0f} bills/sec, "
+          f"{args.workers or 'no'} workers)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+import numpy as np
+import pandas as pd
+
+# Product catalog: unit price (Rs.) and the row name used in item_stock_dataset.csv
+CATALOG = {
+    "Smartphones": {"unit_price": 40000, "stock_item": "Mobiles"},
+    "Laptops": {"unit_price": 75000, "stock_item": "Laptops"},
+    "Tablets": {"unit_price": 30000, "stock_item": "Tablets"},
+    "Headphones": {"unit_price": 10000, "stock_item": "Headphones"},
+    "Smartwatches": {"unit_price": 5000, "stock_item": "Smartwatches"},
+}
+
+PRODUCTS = list(CATALOG)
+PRODUCT_DTYPE = pd.CategoricalDtype(PRODUCTS)
+UNIT_PRICES = np.array([CATALOG[p]["unit_price"] for p in PRODUCTS], dtype=np.int64)
+
+
+def unit_price(product):
+    return CATALOG[product]["unit_price"] if product in CATALOG else 0
+
+
+def stock_item(product):
+    return CATALOG[product]["stock_item"]
+
+
+def aggregate_sales(sales):
+    # One groupby over a categorical Product column gives units per product for
+    # every catalog entry (zero for products with no rows), in catalog order.
+    # Products missing from the catalog fall out as NaN categories.
+    product = sales["Product"]
+    if product.dtype != PRODUCT_DTYPE:
+        product = product.astype(PRODUCT_DTYPE)
+    # Unordered categoricals with the same categories compare equal whatever
+    # their order, so align the result by label rather than by position
+    units = (sales["Sales"].groupby(product, observed=False).sum()
+             .reindex(PRODUCTS, fill_value=0).to_numpy(dtype=np.int64))
+    return pd.DataFrame(
+        {"units": units, "revenue": units * UNIT_PRICES},
+        index=pd.Index(PRODUCTS, name="Product"),
+    )
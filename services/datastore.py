@@ -0,0 +1,184 @@
+import argparse
+import glob
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+# Columnar binary copies of the CSV datasets. Each CSV gets a directory
+# .columns/<name>/ next to it with one .npy file per column, stored in a
+# compact dtype (categoricals as int8 codes, int32 ids, float32 values), and
+# a manifest.json. Readers memory-map only the columns they ask for. The CSV
+# stays the import/export format: the copy is rebuilt whenever the CSV's
+# mtime or size no longer match the manifest.
+
+MANIFEST = 'manifest.json'
+
+# Text columns with at most this many distinct values are stored as categoricals
+MAX_CATEGORIES = 1000
+# Text columns parsed as dates (stored as datetime64[D])
+DATE_COLUMNS = {'Date'}
+
+
+def store_dir(csv_path):
+    directory, filename = os.path.split(os.path.abspath(csv_path))
+    return os.path.join(directory, '.columns', os.path.splitext(filename)[0])
+
+
+def _source_signature(csv_path):
+    st = os.stat(csv_path)
+    return {"mtime_ns": st.st_mtime_ns, "size": st.st_size}
+
+
+def _int_dtype(values):
+    # 0/1 flags as int8; identifiers and counts as int32 (int64 only if needed),
+    # so appended rows rarely change the stored dtype
+    if len(values) == 0:
+        return np.dtype(np.int32)
+    low, high = values.min(), values.max()
+    if low >= 0 and high <= 1:
+        return np.dtype(np.int8)
+    if np.iinfo(np.int32).min <= low and high <= np.iinfo(np.int32).max:
+        return np.dtype(np.int32)
+    return np.dtype(np.int64)
+
+
+def _compact(name, series):
+    # Returns (array, column metadata)
+    if name in DATE_COLUMNS:
+        return pd.to_datetime(series).to_numpy().astype('datetime64[D]'), {"kind": "date"}
+    if pd.api.types.is_bool_dtype(series):
+        return series.to_numpy(dtype=np.bool_), {"kind": "bool"}
+    if pd.api.types.is_integer_dtype(series):
+        values = series.to_numpy()
+        return values.astype(_int_dtype(values)), {"kind": "int"}
+    if pd.api.types.is_float_dtype(series):
+        return series.to_numpy(dtype=np.float32), {"kind": "float"}
+    if series.nunique(dropna=True) <= MAX_CATEGORIES:
+        categorical = pd.Categorical(series)
+        codes = categorical.codes
+        code_dtype = np.int8 if len(categorical.categories) < 128 else np.int16
+        return codes.astype(code_dtype), {"kind": "category",
+                                          "categories": [str(c) for c in categorical.categories]}
+    values = series.fillna('').astype(str).to_numpy()
+    return values.astype(f"U{max(1, max(map(len, values), default=1))}"), {"kind": "text"}
+
+
+def _write_array(path, array):
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'wb') as f:
+        np.save(f, array, allow_pickle=False)
+    os.replace(tmp_path, path)
+
+
+def build(csv_path):
+    # Converts the CSV into the columnar store and returns the new manifest.
+    # Column files carry the source version in their name, so a reader holding
+    # an older manifest keeps reading a consistent set while this runs.
+    signature = _source_signature(csv_path)
+    data = pd.read_csv(csv_path)
+    directory = store_dir(csv_path)
+    os.makedirs(directory, exist_ok=True)
+    version = f"{signature['mtime_ns']}-{signature['size']}"
+
+    columns = {}
+    for name in data.columns:
+        array, meta = _compact(name, data[name])
+        filename = f"{name}.{version}.npy"
+        _write_array(os.path.join(directory, filename), array)
+        columns[name] = dict(meta, file=filename, dtype=array.dtype.str)
+
+    manifest = {"source": os.path.basename(csv_path), "source_signature": signature,
+                "rows": len(data), "columns": columns}
+    tmp_path = os.path.join(directory, f"{MANIFEST}.{os.getpid()}.tmp")
+    with open(tmp_path, 'w') as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp_path, os.path.join(directory, MANIFEST))
+
+    # Column files of older versions; open memory maps stay valid on POSIX
+    current = {column["file"] for column in columns.values()}
+    for path in glob.glob(os.path.join(directory, '*.npy')):
+        if os.path.basename(path) not in current:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+    return manifest
+
+
+def _read_manifest(csv_path):
+    try:
+        with open(os.path.join(store_dir(csv_path), MANIFEST)) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def manifest(csv_path):
+    # Current manifest, rebuilding the store first if the CSV has changed
+    current = _read_manifest(csv_path)
+    if current is None or current["source_signature"] != _source_signature(csv_path):
+        current = build(csv_path)
+    return current
+
+
+def row_count(csv_path):
+    # Same CSV fallback as read() when the store cannot be written
+    try:
+        return manifest(csv_path)["rows"]
+    except OSError:
+        return len(pd.read_csv(csv_path, usecols=[0]))
+
+
+def column_arrays(csv_path, columns=None, mmap=True):
+    # Raw stored arrays (categoricals as codes) by column name, memory-mapped
+    # read-only by default. Returns (arrays, manifest).
+    current = manifest(csv_path)
+    directory = store_dir(csv_path)
+    names = list(current["columns"]) if columns is None else list(columns)
+    missing = [name for name in names if name not in current["columns"]]
+    if missing:
+        raise KeyError(f"{current['source']} has no column(s) {missing}")
+    arrays = {name: np.load(os.path.join(directory, current["columns"][name]["file"]),
+                            mmap_mode='r' if mmap else None, allow_pickle=False)
+              for name in names}
+    return arrays, current
+
+
+def read(csv_path, columns=None, mmap=True):
+    # DataFrame with the requested columns, like pd.read_csv(usecols=...) but
+    # in compact dtypes and without parsing text; falls back to the CSV when
+    # the store cannot be written (e.g. a read-only directory)
+    try:
+        arrays, current = column_arrays(csv_path, columns, mmap)
+    except OSError:
+        return pd.read_csv(csv_path, usecols=columns)[columns] if columns else pd.read_csv(csv_path)
+    frame = {}
+    for name, array in arrays.items():
+        meta = current["columns"][name]
+        if meta["kind"] == "category":
+            frame[name] = pd.Categorical.from_codes(np.asarray(array), categories=meta["categories"])
+        else:
+            frame[name] = array
+    return pd.DataFrame(frame, copy=False)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the columnar copies of CSV datasets.")
+    parser.add_argument('csv', nargs='*', help="CSV files (default: datasets/*.csv)")
+    args = parser.parse_args()
+
+    for csv_path in args.csv or sorted(glob.glob(os.path.join('datasets', '*.csv'))):
+        current = manifest(csv_path)
+        directory = store_dir(csv_path)
+        stored = sum(os.path.getsize(os.path.join(directory, column["file"]))
+                     for column in current["columns"].values())
+        dtypes = ", ".join(f"{name}:{column['kind'] if column['kind'] == 'category' else column['dtype']}"
+                           for name, column in current["columns"].items())
+        print(f"{csv_path}: {current['rows']:,} rows, {os.path.getsize(csv_path):,} bytes CSV -> "
+              f"{stored:,} bytes columnar ({dtypes})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+import os
+
+import pandas as pd
+
+from services import sqlitedb
+
+# Staff records in SQLite, keyed by EmailID (case-insensitive), with indexes
+# on the columns the Employees page sorts by. Adds and removes touch one row;
+# listings are sorted, filtered and paginated by the database.
+# employee_dataset.csv is only used to seed a new store and for export.
+DB_PATH = os.environ.get("EMPLOYEE_DB_PATH", "datasets/employees.db")
+SEED_CSV = 'datasets/employee_dataset.csv'
+
+# DataFrame column -> table column
+COLUMNS = {
+    "Name": "name",
+    "EmailID": "email",
+    "YearsExperience": "years_experience",
+    "EducationLevel": "education_level",
+    "SkillScore": "skill_score",
+    "Certifications": "certifications",
+}
+SORT_COLUMNS = ["Name", "EmailID", "YearsExperience", "SkillScore", "Certifications"]
+
+
+class EmployeeError(ValueError):
+    pass
+
+
+def _init(conn):
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS employees ("
+        " email TEXT PRIMARY KEY COLLATE NOCASE,"
+        " name TEXT NOT NULL,"
+        " years_experience INTEGER NOT NULL,"
+        " education_level TEXT NOT NULL,"
+        " skill_score REAL NOT NULL,"
+        " certifications INTEGER NOT NULL)"
+    )
+    # One index per sortable column; email breaks ties so pages are stable
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_employees_name ON employees (name, email)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_employees_experience ON employees (years_experience, email)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_employees_skill ON employees (skill_score, email)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_employees_certifications ON employees (certifications, email)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_employees_education ON employees (education_level)")
+    empty = conn.execute("SELECT COUNT(*) FROM employees").fetchone()[0] == 0
+    if empty and os.path.exists(SEED_CSV):
+        seed = pd.read_csv(SEED_CSV)
+        # Earlier rows win when the CSV repeats an EmailID
+        conn.executemany(
+            "INSERT OR IGNORE INTO employees (name, email, years_experience, education_level, skill_score,"
+            " certifications) VALUES (?, ?, ?, ?, ?, ?)",
+            [_row(record) for record in seed.to_dict('records')])
+
+
+def _conn():
+    return sqlitedb.connection(DB_PATH, _init)
+
+
+def _row(employee):
+    # Validated tuple in table column order; employee uses the CSV column names
+    email = str(employee["EmailID"]).strip()
+    name = str(employee["Name"]).strip()
+    if not email or not name:
+        raise EmployeeError("Name and EmailID are required")
+    return (name, email, int(employee["YearsExperience"]), str(employee["EducationLevel"]),
+            float(employee["SkillScore"]), int(employee["Certifications"]))
+
+
+def _frame(rows):
+    return pd.DataFrame(rows, columns=list(COLUMNS))
+
+
+_SELECT = ("SELECT name, email, years_experience, education_level, skill_score, certifications"
+           " FROM employees")
+
+
+def add(employee):
+    # employee: mapping with the employee_dataset.csv columns
+    row = _row(employee)
+    with sqlitedb.transaction(_conn()) as conn:
+        inserted = conn.execute(
+            "INSERT OR IGNORE INTO employees (name, email, years_experience, education_level, skill_score,"
+            " certifications) VALUES (?, ?, ?, ?, ?, ?)", row).rowcount
+    if not inserted:
+        raise EmployeeError(f"An employee with email {row[1]} already exists")
+
+
+def remove(email):
+    # True if a record was removed
+    with sqlitedb.transaction(_conn()) as conn:
+        return conn.execute("DELETE FROM employees WHERE email = ?", (email.strip(),)).rowcount > 0
+
+
+def get(email):
+    row = _conn().execute(f"{_SELECT} WHERE email = ?", (email.strip(),)).fetchone()
+    return None if row is None else dict(zip(COLUMNS, row))
+
+
+def _where(search, education_level):
+    clauses, params = [], []
+    if search:
+        pattern = "%" + search.strip().replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+        clauses.append("(name LIKE ? ESCAPE '\\' OR email LIKE ? ESCAPE '\\')")
+        params += [pattern, pattern]
+    if education_level:
+        clauses.append("education_level = ?")
+        params.append(education_level)
+    return (f"WHERE {' AND '.join(clauses)}" if clauses else ""), params
+
+
+def count(search=None, education_level=None):
+    where, params = _where(search, education_level)
+    return _conn().execute(f"SELECT COUNT(*) FROM employees {where}", params).fetchone()[0]
+
+
+def page(offset=0, limit=50, sort="Name", descending=False, search=None, education_level=None, total=None):
+    # One page of employees, sorted and filtered in SQL. Returns (DataFrame,
+    # total matches); pass total when the caller already ran count() for
+    # the same filters.
+    if sort not in SORT_COLUMNS:
+        raise EmployeeError(f"Cannot sort by {sort}; choose from {SORT_COLUMNS}")
+    direction = "DESC" if descending else "ASC"
+    where, params = _where(search, education_level)
+    rows = _conn().execute(
+        f"{_SELECT} {where} ORDER BY {COLUMNS[sort]} {direction}, email {direction} LIMIT ? OFFSET ?",
+        (*params, int(limit), int(offset)),
+    ).fetchall()
+    return _frame(rows), count(search, education_level) if total is None else total
+
+
+def education_levels():
+    return [row[0] for row in _conn().execute(
+        "SELECT DISTINCT education_level FROM employees ORDER BY education_level")]
+
+
+def export_csv(path=SEED_CSV):
+    _frame(_conn().execute(f"{_SELECT} ORDER BY rowid").fetchall()).to_csv(path, index=False)
@@ -0,0 +1,75 @@
+import os
+import threading
+
+from services import datastore, salesfacts, viplog
+from services.catalog import aggregate_sales
+
+# Files the dashboard KPIs are derived from
+SALES_PATH = 'datasets/electronics_sales_updated.csv'
+CUSTOMERS_PATH = 'datasets/customer_behavior_vip.csv'
+
+_lock = threading.Lock()
+_cache = {"signature": None, "base": None}
+
+
+def _signature(paths):
+    # (mtime, size) per file is enough to notice a rewrite without reading it
+    signature = []
+    for path in paths:
+        if os.path.exists(path):
+            st = os.stat(path)
+            signature.append((path, st.st_mtime_ns, st.st_size))
+        else:
+            signature.append((path, None, None))
+    return tuple(signature)
+
+
+def compute_base():
+    # Aggregates of the static CSVs; the expensive part, cached by get_kpis()
+    # Memory-mapped columns from the dataset store; the customer count comes
+    # from its manifest without touching any column
+    electronic_sales = datastore.read(SALES_PATH, ['Product', 'Sales'])
+    return {
+        "units": int(electronic_sales['Sales'].sum()),
+        "by_product": aggregate_sales(electronic_sales),
+        "customers": datastore.row_count(CUSTOMERS_PATH),
+    }
+
+
+def combine(base, live_totals, live_by_product):
+    # Historical CSV sales plus bills generated since, from the running
+    # aggregates in the sales fact store (no rescan of either source)
+    by_product = base["by_product"].add(live_by_product, fill_value=0).astype('int64')
+    # add() sorts the union of labels; keep catalog order
+    known = base["by_product"].index
+    by_product = by_product.reindex(known.append(by_product.index.difference(known)))
+    total_revenue = int(by_product['revenue'].sum())
+
+    # Customers checked on the VIP page but not yet compacted into the CSV
+    num_customers = base["customers"] + viplog.pending_count()
+
+    return {
+        "total_orders": base["units"] + live_totals["units"],
+        "total_revenue": int(total_revenue // 10000000),
+        "num_customers": num_customers,
+        "avg_order": round(total_revenue / num_customers, 2) if num_customers else 0,
+        "by_product": by_product,
+        "live_bills": live_totals["bills"],
+    }
+
+
+def compute_kpis():
+    return combine(compute_base(), salesfacts.totals(), salesfacts.by_product())
+
+
+def get_kpis():
+    # The CSV aggregates are shared by every Streamlit session in the process
+    # and only recomputed when a source file changes on disk; live sales are
+    # two primary-key reads on the aggregate tables per call.
+    signature = _signature([SALES_PATH, CUSTOMERS_PATH])
+    with _lock:
+        if _cache["signature"] != signature:
+            _cache["base"] = compute_base()
+            _cache["signature"] = signature
+        base = _cache["base"]
+    return combine(base, salesfacts.totals(), salesfacts.by_product())
@@ -0,0 +1,120 @@
+import os
+import sys
+import threading
+import time
+
+import joblib
+import numpy as np
+
+# Paths of the models used by the dashboard
+VIP_MODEL = 'models/customervipcheck/vip_model.joblib'
+HIRE_MODEL = 'models/employeehire/hire_model.joblib'
+
+
+def sales_model_path(product):
+    return f"models/sales/{product.lower()}_model.joblib"
+
+
+# One entry per model file, shared by every Streamlit session in the process
+_lock = threading.Lock()
+_models = {}
+
+
+def _deep_size(obj, seen=None):
+    # Approximate in-memory size of a fitted estimator: numpy buffers plus
+    # the Python containers holding them (tree internals via __getstate__)
+    if seen is None:
+        seen = {}
+    if id(obj) in seen:
+        return 0
+    # Keep a reference so temporaries (e.g. __getstate__ dicts) are not
+    # freed and their ids reused while walking
+    seen[id(obj)] = obj
+    if isinstance(obj, np.ndarray):
+        return obj.nbytes
+    size = sys.getsizeof(obj)
+    if isinstance(obj, (str, bytes, int, float, bool, type(None))):
+        return size
+    if isinstance(obj, dict):
+        return size + sum(_deep_size(k, seen) + _deep_size(v, seen) for k, v in obj.items())
+    if isinstance(obj, (list, tuple, set, frozenset)):
+        return size + sum(_deep_size(item, seen) for item in obj)
+    if hasattr(obj, "__dict__"):
+        return size + _deep_size(vars(obj), seen)
+    if hasattr(obj, "__getstate__"):
+        try:
+            state = obj.__getstate__()
+        except TypeError:
+            return size
+        return size + _deep_size(state, seen)
+    return size
+
+
+def _load(path):
+    st = os.stat(path)
+    start = time.perf_counter()
+    if path.endswith('.npz'):
+        from AI.compiledforest import CompiledForest
+        model = CompiledForest.load(path)
+    else:
+        model = joblib.load(path)
+    load_seconds = time.perf_counter() - start
+    return {
+        "model": model,
+        "mtime_ns": st.st_mtime_ns,
+        "size": st.st_size,
+        "load_seconds": load_seconds,
+        "memory_bytes": _deep_size(model),
+        "loads": 0,
+        "hits": 0,
+    }
+
+
+def get_model(path):
+    # Loaded once per process; reloaded when the file on disk is replaced
+    st = os.stat(path)
+    with _lock:
+        entry = _models.get(path)
+        if entry is None or entry["mtime_ns"] != st.st_mtime_ns or entry["size"] != st.st_size:
+            loads = entry["loads"] if entry else 0
+            hits = entry["hits"] if entry else 0
+            entry = _load(path)
+            entry["loads"] = loads + 1
+            entry["hits"] = hits
+            _models[path] = entry
+        entry["hits"] += 1
+        return entry["model"]
+
+
+def get_predictor(path):
+    # The compiled array form of a forest pipeline (AI/compiledforest.py) when
+    # it is at least as new as the joblib file, otherwise the pipeline itself.
+    # Both take the same DataFrame and return the same predictions.
+    from AI.compiledforest import compiled_path
+
+    compiled = compiled_path(path)
+    if os.path.exists(compiled) and (
+            not os.path.exists(path) or os.stat(compiled).st_mtime_ns >= os.stat(path).st_mtime_ns):
+        return get_model(compiled)
+    return get_model(path)
+
+
+def warm(paths):
+    # Preload models so the first prediction does not pay for deserialization
+    for path in paths:
+        if os.path.exists(path):
+            get_predictor(path)
+
+
+def stats():
+    with _lock:
+        return {
+            path: {
+                "file_bytes": entry["size"],
+                "load_seconds": round(entry["load_seconds"], 4),
+                "memory_bytes": entry["memory_bytes"],
+                "loads": entry["loads"],
+                "hits": entry["hits"],
+            }
+            for path, entry in _models.items()
+        }
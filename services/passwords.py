@@ -0,0 +1,91 @@
+import argparse
+import base64
+import hashlib
+import hmac
+import os
+import time
+
+# Salted PBKDF2-HMAC-SHA256. The iteration count is the cost knob: pick it with
+# the benchmark below so a shift-start login storm stays inside the latency budget.
+ALGORITHM = "pbkdf2_sha256"
+ITERATIONS = int(os.environ.get("PASSWORD_HASH_ITERATIONS", "100000"))
+SALT_BYTES = 16
+
+
+def _b64(raw):
+    return base64.b64encode(raw).decode("ascii")
+
+
+def _derive(password, salt, iterations):
+    return hashlib.pbkdf2_hmac("sha256", password.encode("utf-8"), salt, iterations)
+
+
+def hash_password(password, iterations=None):
+    iterations = iterations or ITERATIONS
+    salt = os.urandom(SALT_BYTES)
+    return f"{ALGORITHM}${iterations}${_b64(salt)}${_b64(_derive(password, salt, iterations))}"
+
+
+def is_hashed(stored):
+    return isinstance(stored, str) and stored.startswith(ALGORITHM + "$")
+
+
+def verify_password(password, stored):
+    if not is_hashed(stored):
+        # Accounts registered before hashing was introduced store the raw password
+        return stored is not None and hmac.compare_digest(str(stored).encode("utf-8"), password.encode("utf-8"))
+    _, iterations, salt, expected = stored.split("$")
+    derived = _derive(password, base64.b64decode(salt), int(iterations))
+    return hmac.compare_digest(derived, base64.b64decode(expected))
+
+
+def needs_rehash(stored, iterations=None):
+    # Legacy plaintext or a hash made with a different cost setting
+    if not is_hashed(stored):
+        return True
+    return int(stored.split("$")[1]) != (iterations or ITERATIONS)
+
+
+def _verifications_per_second(iterations, seconds):
+    stored = hash_password("benchmark-password", iterations)
+    count = 0
+    start = time.perf_counter()
+    while time.perf_counter() - start < seconds:
+        verify_password("benchmark-password", stored)
+        count += 1
+    return count / (time.perf_counter() - start)
+
+
+def benchmark(costs, seconds=1.0, storm=500, cores=None):
+    # Logins/sec on one core per cost, and how long `storm` simultaneous logins
+    # take when spread over `cores` cores
+    cores = cores or os.cpu_count() or 1
+    results = []
+    for iterations in costs:
+        rate = _verifications_per_second(iterations, seconds)
+        results.append({
+            "iterations": iterations,
+            "logins_per_sec_per_core": rate,
+            "ms_per_login": 1000 / rate,
+            "storm_seconds": storm / (rate * cores),
+        })
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark password verification cost settings.")
+    parser.add_argument("--costs", type=int, nargs="+", default=[10000, 50000, 100000, 200000, 600000])
+    parser.add_argument("--seconds", type=float, default=1.0, help="measurement time per cost")
+    parser.add_argument("--storm", type=int, default=500, help="simultaneous logins to size for")
+    parser.add_argument("--cores", type=int, default=None, help="cores serving logins (default: all)")
+    args = parser.parse_args()
+
+    cores = args.cores or os.cpu_count() or 1
+    print(f"{'iterations':>10} {'logins/s/core':>14} {'ms/login':>9} {f'{args.storm} logins on {cores} cores':>24}")
+    for row in benchmark(args.costs, args.seconds, args.storm, cores):
+        print(f"{row['iterations']:>10} {row['logins_per_sec_per_core']:>14.1f} "
+              f"{row['ms_per_login']:>9.2f} {row['storm_seconds']:>23.2f}s")
+
+
+if __name__ == "__main__":
+    main()
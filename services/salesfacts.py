@@ -0,0 +1,147 @@
+import os
+from datetime import datetime
+
+import pandas as pd
+
+from services import sqlitedb
+
+# Sales facts live in the bills database, so a bill and its facts are committed
+# in the same transaction. Each append also bumps running per-product,
+# per-month and overall totals, so dashboard reads never rescan the facts.
+DB_PATH = os.environ.get("BILLS_DB_PATH", "datasets/bills.db")
+# PRAGMA user_version of a bills database whose older bills have been backfilled
+FACTS_VERSION = 1
+
+
+def create_tables(conn):
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS sales_facts ("
+        " id INTEGER PRIMARY KEY AUTOINCREMENT,"
+        " bill_no INTEGER NOT NULL,"
+        " product TEXT NOT NULL,"
+        " month TEXT NOT NULL,"
+        " quantity INTEGER NOT NULL,"
+        " revenue INTEGER NOT NULL,"
+        " created_at REAL NOT NULL)"
+    )
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS sales_by_product ("
+        " product TEXT PRIMARY KEY,"
+        " units INTEGER NOT NULL,"
+        " revenue INTEGER NOT NULL,"
+        " lines INTEGER NOT NULL)"
+    )
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS sales_by_month ("
+        " month TEXT PRIMARY KEY,"
+        " units INTEGER NOT NULL,"
+        " revenue INTEGER NOT NULL,"
+        " bills INTEGER NOT NULL)"
+    )
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS sales_totals ("
+        " id INTEGER PRIMARY KEY CHECK (id = 1),"
+        " bills INTEGER NOT NULL,"
+        " units INTEGER NOT NULL,"
+        " revenue INTEGER NOT NULL)"
+    )
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_sales_facts_bill ON sales_facts (bill_no)")
+    # One-time migration; later repairs go through rebuild()
+    if conn.execute("PRAGMA user_version").fetchone()[0] < FACTS_VERSION:
+        if backfill(conn):
+            rebuild_aggregates(conn)
+        conn.execute(f"PRAGMA user_version = {FACTS_VERSION}")
+
+
+def backfill(conn):
+    # Facts for archived bills that have none (bills from before the fact
+    # table existed). Returns the number of fact rows added.
+    has_bills = conn.execute(
+        "SELECT COUNT(*) FROM sqlite_master WHERE type = 'table' AND name = 'bills'").fetchone()[0]
+    if not has_bills:
+        return 0
+    return conn.execute(
+        "INSERT INTO sales_facts (bill_no, product, month, quantity, revenue, created_at)"
+        " SELECT b.bill_no, l.product, strftime('%Y-%m', b.created_at, 'unixepoch', 'localtime'),"
+        " l.quantity, l.amount, b.created_at"
+        " FROM bills b JOIN bill_lines l ON l.bill_no = b.bill_no"
+        " WHERE NOT EXISTS (SELECT 1 FROM sales_facts f WHERE f.bill_no = b.bill_no)"
+        " ORDER BY b.bill_no, l.line_no").rowcount
+
+
+def _conn():
+    return sqlitedb.connection(DB_PATH, create_tables)
+
+
+def append(conn, bill_no, bill, created_at):
+    # Caller holds the write transaction that inserts the bill
+    month = datetime.fromtimestamp(created_at).strftime("%Y-%m")
+    lines = bill["lines"]
+    conn.executemany(
+        "INSERT INTO sales_facts (bill_no, product, month, quantity, revenue, created_at) VALUES (?, ?, ?, ?, ?, ?)",
+        [(bill_no, line["product"], month, line["quantity"], line["amount"], created_at) for line in lines],
+    )
+    conn.executemany(
+        "INSERT INTO sales_by_product (product, units, revenue, lines) VALUES (?, ?, ?, 1)"
+        " ON CONFLICT (product) DO UPDATE SET units = units + excluded.units,"
+        " revenue = revenue + excluded.revenue, lines = lines + 1",
+        [(line["product"], line["quantity"], line["amount"]) for line in lines],
+    )
+    units = sum(line["quantity"] for line in lines)
+    revenue = sum(line["amount"] for line in lines)
+    conn.execute(
+        "INSERT INTO sales_by_month (month, units, revenue, bills) VALUES (?, ?, ?, 1)"
+        " ON CONFLICT (month) DO UPDATE SET units = units + excluded.units,"
+        " revenue = revenue + excluded.revenue, bills = bills + 1",
+        (month, units, revenue),
+    )
+    conn.execute(
+        "INSERT INTO sales_totals (id, bills, units, revenue) VALUES (1, 1, ?, ?)"
+        " ON CONFLICT (id) DO UPDATE SET bills = bills + 1, units = units + excluded.units,"
+        " revenue = revenue + excluded.revenue",
+        (units, revenue),
+    )
+
+
+def totals():
+    row = _conn().execute("SELECT bills, units, revenue FROM sales_totals WHERE id = 1").fetchone()
+    bills, units, revenue = row if row else (0, 0, 0)
+    return {"bills": bills, "units": units, "revenue": revenue}
+
+
+def by_product():
+    rows = _conn().execute("SELECT product, units, revenue FROM sales_by_product").fetchall()
+    return pd.DataFrame(rows, columns=["Product", "units", "revenue"]).set_index("Product")
+
+
+def by_month():
+    rows = _conn().execute("SELECT month, units, revenue, bills FROM sales_by_month ORDER BY month").fetchall()
+    return pd.DataFrame(rows, columns=["month", "units", "revenue", "bills"]).set_index("month")
+
+
+def rebuild_aggregates(conn):
+    # Recompute the running aggregates from the fact table (repair/backfill
+    # only); caller holds the write transaction
+    conn.execute("DELETE FROM sales_by_product")
+    conn.execute("DELETE FROM sales_by_month")
+    conn.execute("DELETE FROM sales_totals")
+    conn.execute(
+        "INSERT INTO sales_by_product (product, units, revenue, lines)"
+        " SELECT product, SUM(quantity), SUM(revenue), COUNT(*) FROM sales_facts GROUP BY product")
+    conn.execute(
+        "INSERT INTO sales_by_month (month, units, revenue, bills)"
+        " SELECT month, SUM(quantity), SUM(revenue), COUNT(DISTINCT bill_no) FROM sales_facts GROUP BY month")
+    conn.execute(
+        "INSERT INTO sales_totals (id, bills, units, revenue)"
+        " SELECT 1, COUNT(DISTINCT bill_no), SUM(quantity), SUM(revenue) FROM sales_facts HAVING COUNT(*) > 0")
+
+
+def rebuild():
+    with sqlitedb.transaction(_conn()) as conn:
+        backfill(conn)
+        rebuild_aggregates(conn)
+
+
+if __name__ == "__main__":
+    rebuild()
+    print(totals())
@@ -0,0 +1,42 @@
+import sqlite3
+import threading
+from contextlib import contextmanager
+
+# Shared SQLite plumbing for the ledger/archive stores: one WAL-mode connection
+# per thread and database file, and the schema set up once per process.
+
+_local = threading.local()
+_init_lock = threading.Lock()
+_initialized = set()
+
+
+def connection(path, init=None):
+    conns = getattr(_local, "conns", None)
+    if conns is None:
+        conns = _local.conns = {}
+    conn = conns.get(path)
+    if conn is None:
+        conn = sqlite3.connect(path, timeout=30, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conns[path] = conn
+    if init is not None:
+        with _init_lock:
+            if (path, init) not in _initialized:
+                with transaction(conn):
+                    init(conn)
+                _initialized.add((path, init))
+    return conn
+
+
+@contextmanager
+def transaction(conn):
+    # Write transaction that takes the database lock up front, so concurrent
+    # read-modify-write sequences cannot interleave
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        yield conn
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+    conn.execute("COMMIT")
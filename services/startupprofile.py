@@ -0,0 +1,48 @@
+import importlib
+import os
+import sys
+import threading
+import time
+
+# Startup measurement mode: SYSMART_PROFILE_STARTUP=1 streamlit run app.py
+# Records, once per process, how long each page's heavy imports take and how
+# long its first render takes.
+ENABLED = os.environ.get("SYSMART_PROFILE_STARTUP") == "1"
+
+_lock = threading.Lock()
+_timings = {}
+
+
+def _entry(page):
+    return _timings.setdefault(page, {"page": page, "import_seconds": None, "first_render_seconds": None,
+                                      "modules": 0})
+
+
+def import_modules(page, modules):
+    # Imports a page's dependencies up front so their cost is measured on its own
+    with _lock:
+        if _entry(page)["import_seconds"] is not None:
+            return
+    loaded = len(sys.modules)
+    start = time.perf_counter()
+    for module in modules:
+        importlib.import_module(module)
+    seconds = time.perf_counter() - start
+    with _lock:
+        entry = _entry(page)
+        entry["import_seconds"] = round(seconds, 4)
+        entry["modules"] = len(sys.modules) - loaded
+
+
+def record_render(page, seconds):
+    with _lock:
+        entry = _entry(page)
+        if entry["first_render_seconds"] is None:
+            entry["first_render_seconds"] = round(seconds, 4)
+            print(f"[startup] {page}: import {entry['import_seconds']}s "
+                  f"({entry['modules']} new modules), first render {entry['first_render_seconds']}s")
+
+
+def report():
+    with _lock:
+        return [dict(entry) for entry in _timings.values()]
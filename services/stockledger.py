@@ -0,0 +1,175 @@
+import os
+import time
+from datetime import datetime
+
+import pandas as pd
+
+from services import sqlitedb
+
+# Stock levels live in SQLite (WAL mode) so several terminals can update them
+# concurrently. Every change is an atomic increment/decrement plus a row in the
+# movement history; item_stock_dataset.csv is only used to seed a new ledger.
+DB_PATH = os.environ.get("STOCK_DB_PATH", "datasets/stock.db")
+SEED_CSV = 'datasets/item_stock_dataset.csv'
+
+# Items at or below their reorder level are kept in the low_stock watchlist
+LOW_STOCK_LEVEL = int(os.environ.get("LOW_STOCK_LEVEL", "20"))
+
+
+class StockError(ValueError):
+    pass
+
+
+def _conn():
+    return sqlitedb.connection(DB_PATH, _init)
+
+
+def _init(conn):
+    # Runs inside a write transaction, once per process and database
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS stock_levels ("
+        " item TEXT PRIMARY KEY,"
+        " quantity INTEGER NOT NULL CHECK (quantity >= 0),"
+        " updated_at REAL NOT NULL)"
+    )
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS stock_movements ("
+        " id INTEGER PRIMARY KEY AUTOINCREMENT,"
+        " item TEXT NOT NULL,"
+        " delta INTEGER NOT NULL,"
+        " quantity_after INTEGER NOT NULL,"
+        " reason TEXT NOT NULL,"
+        " created_at REAL NOT NULL)"
+    )
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_stock_movements_item ON stock_movements (item, id)")
+    columns = [row[1] for row in conn.execute("PRAGMA table_info(stock_levels)")]
+    if "reorder_level" not in columns:
+        conn.execute(f"ALTER TABLE stock_levels ADD COLUMN reorder_level INTEGER NOT NULL DEFAULT {LOW_STOCK_LEVEL}")
+    new_watchlist = conn.execute(
+        "SELECT COUNT(*) FROM sqlite_master WHERE type = 'table' AND name = 'low_stock'").fetchone()[0] == 0
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS low_stock ("
+        " item TEXT PRIMARY KEY,"
+        " quantity INTEGER NOT NULL,"
+        " reorder_level INTEGER NOT NULL,"
+        " since REAL NOT NULL)"
+    )
+    empty = conn.execute("SELECT COUNT(*) FROM stock_levels").fetchone()[0] == 0
+    if empty and os.path.exists(SEED_CSV):
+        now = time.time()
+        seed = pd.read_csv(SEED_CSV)
+        for item, quantity in zip(seed['item'], seed['stock'].astype(int)):
+            conn.execute("INSERT INTO stock_levels (item, quantity, updated_at, reorder_level) VALUES (?, ?, ?, ?)",
+                         (item, int(quantity), now, LOW_STOCK_LEVEL))
+            conn.execute("INSERT INTO stock_movements (item, delta, quantity_after, reason, created_at)"
+                         " VALUES (?, ?, ?, 'seed', ?)", (item, int(quantity), int(quantity), now))
+    if empty or new_watchlist:
+        # One full pass when the watchlist is created; afterwards it is
+        # maintained row by row in _apply()
+        conn.execute(
+            "INSERT OR REPLACE INTO low_stock (item, quantity, reorder_level, since)"
+            " SELECT item, quantity, reorder_level, ? FROM stock_levels WHERE quantity <= reorder_level",
+            (time.time(),))
+
+
+def _update_watchlist(conn, item, quantity, reorder_level):
+    if quantity <= reorder_level:
+        conn.execute(
+            "INSERT INTO low_stock (item, quantity, reorder_level, since) VALUES (?, ?, ?, ?)"
+            " ON CONFLICT (item) DO UPDATE SET quantity = excluded.quantity",
+            (item, quantity, reorder_level, time.time()))
+    else:
+        conn.execute("DELETE FROM low_stock WHERE item = ?", (item,))
+
+
+def _apply(conn, item, delta, reason):
+    # Caller holds the write transaction
+    updated = conn.execute(
+        "UPDATE stock_levels SET quantity = quantity + ?, updated_at = ?"
+        " WHERE item = ? AND quantity + ? >= 0",
+        (delta, time.time(), item, delta),
+    ).rowcount
+    if updated == 0:
+        row = conn.execute("SELECT quantity FROM stock_levels WHERE item = ?", (item,)).fetchone()
+        if row is None:
+            raise StockError(f"Item not found in stock: {item}")
+        raise StockError(f"Not enough {item} in stock: {row[0]} available, {-delta} requested")
+    quantity, reorder_level = conn.execute(
+        "SELECT quantity, reorder_level FROM stock_levels WHERE item = ?", (item,)).fetchone()
+    conn.execute(
+        "INSERT INTO stock_movements (item, delta, quantity_after, reason, created_at) VALUES (?, ?, ?, ?, ?)",
+        (item, delta, quantity, reason, time.time()),
+    )
+    _update_watchlist(conn, item, quantity, reorder_level)
+    return quantity
+
+
+def adjust(item, delta, reason):
+    # Atomic increment/decrement; never lets a level go negative. Returns the new level.
+    with sqlitedb.transaction(_conn()) as conn:
+        return _apply(conn, item, int(delta), reason)
+
+
+def remove_many(quantities, reason="sale"):
+    # Decrement several items in one transaction: either every line is
+    # reserved or none is (an oversell on any line rolls back the rest)
+    with sqlitedb.transaction(_conn()) as conn:
+        return {item: _apply(conn, item, -int(quantity), reason) for item, quantity in quantities.items()}
+
+
+def add_many(quantities, reason="restock"):
+    # Increment several items in one transaction, e.g. to release a reservation
+    with sqlitedb.transaction(_conn()) as conn:
+        return {item: _apply(conn, item, int(quantity), reason) for item, quantity in quantities.items()}
+
+
+def add(item, quantity, reason="restock"):
+    return adjust(item, quantity, reason)
+
+
+def remove(item, quantity, reason="sale"):
+    return adjust(item, -quantity, reason)
+
+
+def snapshot():
+    # Current level per item; a primary-key table with one row per item
+    rows = _conn().execute("SELECT item, quantity FROM stock_levels ORDER BY rowid").fetchall()
+    return dict(rows)
+
+
+def set_reorder_level(item, reorder_level):
+    with sqlitedb.transaction(_conn()) as conn:
+        conn.execute("UPDATE stock_levels SET reorder_level = ? WHERE item = ?", (int(reorder_level), item))
+        row = conn.execute("SELECT quantity FROM stock_levels WHERE item = ?", (item,)).fetchone()
+        if row is None:
+            raise StockError(f"Item not found in stock: {item}")
+        conn.execute("DELETE FROM low_stock WHERE item = ?", (item,))
+        _update_watchlist(conn, item, row[0], int(reorder_level))
+
+
+def low_stock():
+    # Watchlist kept up to date by every stock change; no scan of stock_levels
+    rows = _conn().execute(
+        "SELECT item, quantity, reorder_level FROM low_stock ORDER BY quantity").fetchall()
+    return [{"item": item, "quantity": quantity, "reorder_level": level} for item, quantity, level in rows]
+
+
+def history(item=None, limit=50):
+    conn = _conn()
+    if item is None:
+        rows = conn.execute(
+            "SELECT id, item, delta, quantity_after, reason, created_at FROM stock_movements"
+            " ORDER BY id DESC LIMIT ?", (limit,)).fetchall()
+    else:
+        rows = conn.execute(
+            "SELECT id, item, delta, quantity_after, reason, created_at FROM stock_movements"
+            " WHERE item = ? ORDER BY id DESC LIMIT ?", (item, limit)).fetchall()
+    movements = pd.DataFrame(rows, columns=["id", "item", "delta", "quantity_after", "reason", "created_at"])
+    # Local time, like the bill archive
+    movements["created_at"] = pd.to_datetime([datetime.fromtimestamp(t) for t in movements["created_at"]])
+    return movements
+
+
+def export_csv(path=SEED_CSV):
+    levels = snapshot()
+    pd.DataFrame({"item": list(levels), "stock": list(levels.values())}).to_csv(path, index=False)
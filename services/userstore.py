@@ -0,0 +1,155 @@
+import os
+import sqlite3
+import threading
+
+from services import passwords
+
+# Backend is chosen by USER_STORE_BACKEND:
+#   mongo     - MongoDB at MONGO_URI (default)
+#   mongomock - in-memory MongoDB stand-in, for local load tests
+#   sqlite    - SQLite file at USER_DB_PATH
+BACKEND = os.environ.get("USER_STORE_BACKEND", "mongo")
+MONGO_URI = os.environ.get("MONGO_URI", "mongodb://localhost:27017")
+MONGO_POOL_SIZE = int(os.environ.get("MONGO_POOL_SIZE", "50"))
+USER_DB_PATH = os.environ.get("USER_DB_PATH", "datasets/users.db")
+
+
+class MongoUserStore:
+    def __init__(self, collection):
+        from pymongo.errors import DuplicateKeyError
+        self._duplicate_error = DuplicateKeyError
+        self.collection = collection
+
+    def ensure_indexes(self):
+        # Unique email: lookups are indexed and duplicates are rejected by the server
+        try:
+            self.collection.create_index("email", unique=True)
+        except self._duplicate_error:
+            # Accounts duplicated by the old check-then-insert registration
+            moved = self.move_duplicate_emails()
+            print(f"userstore: moved {moved} duplicate account(s) to "
+                  f"'{self.collection.name}_duplicates' before creating the unique email index")
+            self.collection.create_index("email", unique=True)
+
+    def move_duplicate_emails(self):
+        # Keeps the first account registered per email (ObjectIds sort by
+        # creation time); the others are moved aside for review, not deleted
+        duplicates = self.collection.database[f"{self.collection.name}_duplicates"]
+        groups = self.collection.aggregate([
+            {"$group": {"_id": "$email", "ids": {"$push": "$_id"}, "count": {"$sum": 1}}},
+            {"$match": {"count": {"$gt": 1}}},
+        ])
+        moved = 0
+        for group in groups:
+            extra = sorted(group["ids"])[1:]
+            documents = list(self.collection.find({"_id": {"$in": extra}}))
+            duplicates.insert_many(documents)
+            moved += self.collection.delete_many({"_id": {"$in": extra}}).deleted_count
+        return moved
+
+    def find_by_email(self, email):
+        return self.collection.find_one({"email": email}, {"_id": 0})
+
+    def create(self, user):
+        # Single insert; the unique index decides whether the email is taken
+        try:
+            self.collection.insert_one(dict(user))
+        except self._duplicate_error:
+            return False
+        return True
+
+    def update_password(self, email, password_hash):
+        self.collection.update_one({"email": email}, {"$set": {"password": password_hash}})
+
+
+class SQLiteUserStore:
+    def __init__(self, path):
+        self.path = path
+        self._local = threading.local()
+
+    def _conn(self):
+        # One connection per thread (Streamlit serves sessions on separate threads)
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
+
+    def ensure_indexes(self):
+        with self._conn() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS users ("
+                " email TEXT PRIMARY KEY,"
+                " name TEXT NOT NULL,"
+                " password TEXT NOT NULL)"
+            )
+
+    def find_by_email(self, email):
+        row = self._conn().execute(
+            "SELECT name, email, password FROM users WHERE email = ?", (email,)
+        ).fetchone()
+        return dict(row) if row else None
+
+    def create(self, user):
+        try:
+            with self._conn() as conn:
+                conn.execute(
+                    "INSERT INTO users (email, name, password) VALUES (?, ?, ?)",
+                    (user["email"], user["name"], user["password"]),
+                )
+        except sqlite3.IntegrityError:
+            return False
+        return True
+
+    def update_password(self, email, password_hash):
+        with self._conn() as conn:
+            conn.execute("UPDATE users SET password = ? WHERE email = ?", (password_hash, email))
+
+
+def _open_store(backend):
+    if backend == "mongo":
+        from pymongo import MongoClient
+        client = MongoClient(MONGO_URI, maxPoolSize=MONGO_POOL_SIZE)
+        return MongoUserStore(client["shop_app"]["users"])
+    if backend == "mongomock":
+        import mongomock
+        return MongoUserStore(mongomock.MongoClient()["shop_app"]["users"])
+    if backend == "sqlite":
+        return SQLiteUserStore(USER_DB_PATH)
+    raise ValueError(f"Unknown USER_STORE_BACKEND: {backend}")
+
+
+_lock = threading.Lock()
+_store = None
+
+
+def get_store():
+    # One store (and one pooled client) per process, shared by all sessions
+    global _store
+    with _lock:
+        if _store is None:
+            store = _open_store(BACKEND)
+            store.ensure_indexes()
+            _store = store
+        return _store
+
+
+def register(name, email, password):
+    # False when the email is already registered
+    return get_store().create({"name": name, "email": email, "password": passwords.hash_password(password)})
+
+
+def authenticate(email, password):
+    # Indexed lookup by email, then the hash is verified in-process
+    store = get_store()
+    user = store.find_by_email(email)
+    if user is None or not passwords.verify_password(password, user.get("password")):
+        return None
+    if passwords.needs_rehash(user["password"]):
+        # Upgrade plaintext accounts and hashes made with an old cost setting
+        store.update_password(email, passwords.hash_password(password))
+    user = dict(user)
+    user.pop("password", None)
+    return user
@@ -0,0 +1,134 @@
+import csv
+import os
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+# VIP checks are appended to a small log next to the customer dataset and
+# folded back into the CSV in batches, so a check never rewrites the dataset.
+CSV_PATH = 'datasets/customer_behavior_vip.csv'
+LOG_PATH = 'datasets/customer_behavior_vip.log'
+SEQ_PATH = 'datasets/customer_behavior_vip.seq'
+LOCK_PATH = 'datasets/customer_behavior_vip.lock'
+
+COLUMNS = ['CustomerID', 'TotalSpend', 'PurchaseFrequency', 'PreferredProduct', 'IsVIP']
+
+# Compact the log into the CSV once this many records are pending
+COMPACT_EVERY = 500
+
+
+@contextmanager
+def _locked():
+    # Exclusive lock across processes (several cashiers / Streamlit servers)
+    with open(LOCK_PATH, 'a+') as lock_file:
+        if fcntl is not None:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+        else:
+            lock_file.seek(0)
+            msvcrt.locking(lock_file.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+            else:
+                lock_file.seek(0)
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def _last_line(path):
+    # Read the last line without scanning the whole file
+    with open(path, 'rb') as f:
+        f.seek(0, os.SEEK_END)
+        end = f.tell()
+        block = b''
+        pos = end
+        while pos > 0 and block.rstrip(b'\r\n').count(b'\n') < 1:
+            step = min(4096, pos)
+            pos -= step
+            f.seek(pos)
+            block = f.read(step) + block
+        lines = block.rstrip(b'\r\n').splitlines()
+        return lines[-1].decode('utf-8') if lines else ''
+
+
+def _read_seq():
+    # SEQ_PATH holds "<last CustomerID> <records pending in the log>"
+    if os.path.exists(SEQ_PATH):
+        with open(SEQ_PATH) as f:
+            last_id, pending = f.read().split()
+        return int(last_id), int(pending)
+
+    # First use: seed from the tail of the dataset (and any existing log)
+    last_id = 0
+    pending = 0
+    for path in (CSV_PATH, LOG_PATH):
+        if os.path.exists(path) and os.path.getsize(path) > 0:
+            first_field = _last_line(path).split(',')[0]
+            if first_field.isdigit():
+                last_id = max(last_id, int(first_field))
+    if os.path.exists(LOG_PATH):
+        with open(LOG_PATH) as f:
+            pending = sum(1 for _ in f)
+    return last_id, pending
+
+
+def _write_seq(last_id, pending):
+    tmp_path = SEQ_PATH + '.tmp'
+    with open(tmp_path, 'w') as f:
+        f.write(f"{last_id} {pending}")
+    os.replace(tmp_path, SEQ_PATH)
+
+
+def append(total_spend, purchase_frequency, preferred_product, is_vip):
+    # Allocate the next CustomerID and append one record; O(1) in dataset size
+    with _locked():
+        last_id, pending = _read_seq()
+        customer_id = last_id + 1
+        with open(LOG_PATH, 'a', newline='') as f:
+            csv.writer(f, lineterminator='\n').writerow([customer_id, total_spend, purchase_frequency, preferred_product, int(is_vip)])
+        pending += 1
+        if pending >= COMPACT_EVERY:
+            _compact()
+            pending = 0
+        _write_seq(customer_id, pending)
+    return customer_id
+
+
+def pending_count():
+    with _locked():
+        return _read_seq()[1]
+
+
+def _compact():
+    if not os.path.exists(LOG_PATH) or os.path.getsize(LOG_PATH) == 0:
+        return
+    with open(LOG_PATH, 'rb') as f:
+        records = f.read()
+    with open(CSV_PATH, 'rb+') as f:
+        f.seek(0, os.SEEK_END)
+        if f.tell() > 0:
+            f.seek(-1, os.SEEK_END)
+            if f.read(1) != b'\n':
+                f.write(b'\n')
+        f.write(records)
+        f.flush()
+        os.fsync(f.fileno())
+    open(LOG_PATH, 'w').close()
+
+
+def compact():
+    # Fold pending log records into the CSV read by AI/customertraining.py
+    with _locked():
+        last_id, _ = _read_seq()
+        _compact()
+        _write_seq(last_id, 0)
+
+
+if __name__ == "__main__":
+    compact()
+    print(f"Compacted {LOG_PATH} into {CSV_PATH}")